@@ -0,0 +1,57 @@
+from pygame.sprite import Group
+from spatialGrid import SpatialGrid
+
+
+class ActivationRegion:
+    # keeps the sprites of a level asleep until the camera gets near them, so updates, animation
+    # and collision checks only run for the ones around the view no matter how long the map is
+    def __init__(self, groups, margin=128, cell_size=256):
+        self.groups = groups    # group name -> every sprite of that kind in the level
+        self.awake = {name: Group() for name in groups}     # group name -> sprites near the view
+        self.sleeping = SpatialGrid(cell_size)
+        self.names = {}     # id(sprite) -> group name, for sleeping sprites
+        self.margin = margin    # how far outside the view sprites wake up
+        self.max_awake = 0    # most sprites awake at once
+
+    def reset(self):
+        # put every sprite to sleep, the ones near the view wake on the next update
+        self.sleeping.clear()
+        self.names.clear()
+        for name, group in self.groups.items():
+            self.awake[name].empty()
+            for sprite in group:
+                self.sleep(sprite, name)
+
+    def sleep(self, sprite, name):
+        self.awake[name].remove(sprite)
+        self.sleeping.add(sprite)
+        self.names[id(sprite)] = name
+
+    @staticmethod
+    def can_sleep(sprite):
+        # dying enemies finish their animation (and award points) wherever they are
+        return not getattr(sprite, 'dead', False)
+
+    def update(self, view_rect):
+        # wake sprites that came into range and put the ones that left it to sleep, sprites
+        # sleep further out than they wake so ones on the edge don't toggle every frame
+        wake_rect = view_rect.inflate(self.margin * 2, self.margin * 2)
+        sleep_rect = view_rect.inflate(self.margin * 4, self.margin * 4)
+        for sprite in self.sleeping.query(wake_rect):
+            if wake_rect.colliderect(sprite.rect):
+                self.sleeping.remove(sprite)
+                name = self.names.pop(id(sprite))
+                if sprite.alive():      # skip sprites killed while asleep
+                    self.awake[name].add(sprite)
+        for name, group in self.awake.items():
+            for sprite in group.sprites():
+                if not sleep_rect.colliderect(sprite.rect) and self.can_sleep(sprite):
+                    self.sleep(sprite, name)
+        self.max_awake = max(self.max_awake, self.count_awake())
+
+    def count_awake(self):
+        return sum(len(group) for group in self.awake.values())
+
+    def stats(self):
+        # how many sprites are being updated against how many are asleep
+        return {'awake': self.count_awake(), 'asleep': len(self.sleeping), 'max_awake': self.max_awake}
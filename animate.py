@@ -1,40 +1,39 @@
-from pygame import image, time
+from animationScheduler import animation_scheduler
+from assetCache import asset_cache
 
 
 class Animate:
-    # takes care of the animations
+    # takes care of the animations, frames are timed by the animation scheduler
     def __init__(self, image_list, delay=150, repeat=True):
-        self.images = []
-        for image_file in image_list:
-            if isinstance(image_file, str):  # needs to be loaded
-                self.images.append(image.load(image_file))
-            else:  # already loaded
-                self.images.append(image_file)
-        self.image_index = 0
-        self.last_frame = time.get_ticks()
+        if all(isinstance(image_file, str) for image_file in image_list):
+            self.images = asset_cache.load_images(image_list)     # frames shared with other animations
+        else:
+            images = []
+            for image_file in image_list:
+                if isinstance(image_file, str):  # needs to be loaded
+                    images.append(asset_cache.load_image(image_file))
+                else:  # already loaded
+                    images.append(image_file)
+            self.images = tuple(images)
         self.frame_delay = delay
         self.repeat = repeat
-        self.done = False
+        # looping animations share a track with every other sprite showing the same frames,
+        # animations that play once get their own when they start
+        self.track = animation_scheduler.track(self.images, delay) if repeat else None
 
     def reset(self):
         # sets animations to first frame
-        self.image_index = 0
+        if not self.repeat:
+            self.track = None
 
     def is_animation_done(self):
         # checks if the animation is done
         if self.repeat:
             return True
-        return self.done
+        return self.track is not None and self.track.done
 
     def get_image(self):
         # gets current image in the animation
-        next_frame = abs(self.last_frame - time.get_ticks()) > self.frame_delay
-        if next_frame and self.repeat:
-            self.image_index = (self.image_index + 1) % len(self.images)
-            self.last_frame = time.get_ticks()
-        elif next_frame and not self.image_index >= len(self.images) - 1:
-            self.image_index += 1
-            self.last_frame = time.get_ticks()
-        elif next_frame and not self.repeat:
-            self.done = True
-        return self.images[self.image_index]
+        if self.track is None:
+            self.track = animation_scheduler.play_once(self.images, self.frame_delay)
+        return self.track.image
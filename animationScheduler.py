@@ -0,0 +1,85 @@
+from gameClock import game_clock
+
+
+class Track:
+    # current frame of a looping animation, shared by every sprite playing the same frames at the same speed
+    def __init__(self, images):
+        self.images = images
+        self.index = 0
+        self.image = images[0]
+        self.done = False
+
+    def advance(self):
+        self.index = (self.index + 1) % len(self.images)
+        self.image = self.images[self.index]
+
+
+class OneShot(Track):
+    # animation that plays through once for a single sprite, e.g. an explosion
+    def advance(self):
+        # move to the next frame, returns False once the animation has finished
+        if self.index < len(self.images) - 1:
+            self.index += 1
+            self.image = self.images[self.index]
+            return True
+        self.done = True
+        return False
+
+
+class DelayGroup:
+    # the animations that change frame every delay milliseconds, advanced together
+    def __init__(self, delay, now):
+        self.delay = delay
+        self.last_frame = now
+        self.tracks = {}    # frames -> shared Track
+        self.one_shots = []
+
+
+class AnimationScheduler:
+    # advances every animation in one pass per frame, reading the clock once and only
+    # touching the animations whose delay has passed instead of every sprite timing itself
+    def __init__(self):
+        self.groups = {}    # delay -> DelayGroup
+
+    def get_group(self, delay):
+        group = self.groups.get(delay)
+        if group is None:
+            group = self.groups[delay] = DelayGroup(delay, game_clock.get_ticks())
+        return group
+
+    def track(self, images, delay):
+        # shared looping animation for a tuple of frames
+        group = self.get_group(delay)
+        track = group.tracks.get(images)
+        if track is None:
+            track = group.tracks[images] = Track(images)
+        return track
+
+    def play_once(self, images, delay):
+        # new animation that stops on its last frame
+        one_shot = OneShot(images)
+        self.get_group(delay).one_shots.append(one_shot)
+        return one_shot
+
+    def restart(self):
+        # start every animation from its first frame with its timer at the current game time
+        now = game_clock.get_ticks()
+        for group in self.groups.values():
+            group.last_frame = now
+            for track in group.tracks.values():
+                track.index = 0
+                track.image = track.images[0]
+
+    def update(self):
+        # advance the animations of every delay that has passed since their last frame
+        now = game_clock.get_ticks()
+        for group in self.groups.values():
+            if abs(now - group.last_frame) > group.delay:
+                group.last_frame = now
+                for track in group.tracks.values():
+                    track.advance()
+                if group.one_shots:
+                    group.one_shots = [one_shot for one_shot in group.one_shots if one_shot.advance()]
+
+
+animation_scheduler = AnimationScheduler()
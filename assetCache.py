@@ -0,0 +1,92 @@
+from pygame import display, image, transform, SRCALPHA
+
+CONVERT = 'convert'             # display pixel format
+CONVERT_ALPHA = 'convert_alpha'  # display pixel format with per pixel alpha
+AUTO = 'auto'                   # display pixel format, with per pixel alpha if the file has it
+
+
+def is_display_format(surface):
+    # True if blitting the surface to the screen needs no pixel format conversion
+    screen = display.get_surface()
+    if screen is None:
+        return True
+    return surface.get_bitsize() == screen.get_bitsize() and surface.get_masks()[:3] == screen.get_masks()[:3]
+
+
+def to_display_format(surface):
+    # copy of a surface in the display pixel format, keeping its transparency
+    if surface.get_flags() & SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+class AssetCache:
+    # process wide cache of decoded images, keyed by path, scale and convert mode, so each
+    # image file is decoded once no matter how many sprites use it
+    def __init__(self):
+        self.images = {}
+        self.image_lists = {}
+        self.hits = 0
+        self.misses = 0
+        self.unconverted = set()    # ids of surfaces seen drawn in a format other than the display's
+
+    def load_image(self, path, scale=None, convert=AUTO):
+        # shared surface for an image file, optionally scaled to (width, height), converted to the
+        # display format once there is a display unless convert is None
+        if convert == AUTO and display.get_surface() is None:
+            convert = None      # nothing to convert to yet, ask again once the display is set
+        key = (path, tuple(scale) if scale else None, convert)
+        surface = self.images.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        if scale or convert:
+            surface = self.load_image(path, convert=None)   # decode once and derive the variants from it
+            if convert == CONVERT:
+                surface = surface.convert()
+            elif convert == CONVERT_ALPHA:
+                surface = surface.convert_alpha()
+            elif convert == AUTO:
+                surface = to_display_format(surface)
+            if scale:
+                surface = transform.scale(surface, tuple(scale))
+        else:
+            surface = image.load(path)
+        self.images[key] = surface
+        return surface
+
+    def load_images(self, paths, scale=None, convert=AUTO):
+        # shared tuple of surfaces for a list of image files, e.g. the frames of an animation
+        if convert == AUTO and display.get_surface() is None:
+            convert = None
+        key = (tuple(paths), tuple(scale) if scale else None, convert)
+        surfaces = self.image_lists.get(key)
+        if surfaces is None:
+            surfaces = tuple(self.load_image(path, scale, convert) for path in paths)
+            self.image_lists[key] = surfaces
+        else:
+            self.hits += len(surfaces)
+        return surfaces
+
+    def check_drawn(self, sprites):
+        # diagnostic, remember every sprite image that reaches the renderer unconverted
+        for sprite in sprites:
+            if not is_display_format(sprite.image):
+                self.unconverted.add(id(sprite.image))
+
+    def stats(self):
+        # hit/miss counters for the cache
+        return {'hits': self.hits, 'misses': self.misses, 'images': len(self.images),
+                'unconverted': len(self.unconverted)}
+
+    def clear(self):
+        # forget every cached image
+        self.images.clear()
+        self.image_lists.clear()
+        self.hits = 0
+        self.misses = 0
+        self.unconverted.clear()
+
+
+asset_cache = AssetCache()
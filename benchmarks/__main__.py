@@ -0,0 +1,49 @@
+# Benchmarks for the simulation and rendering hot paths, run from the repository root:
+#   python -m benchmarks --save benchmarks/baseline.json
+#   python -m benchmarks --compare benchmarks/baseline.json
+from argparse import ArgumentParser
+import os
+import sys
+
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+from benchmarks.harness import save_baseline, load_baseline, compare   # noqa: E402
+from benchmarks.scenarios import micro_benchmarks, stress_benchmarks    # noqa: E402
+
+
+def main():
+    parser = ArgumentParser(prog='python -m benchmarks', description='Benchmark the game hot paths')
+    parser.add_argument('--save', help='write results to a baseline json file')
+    parser.add_argument('--compare', help='compare results to a baseline json file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slow down before a result counts as a regression')
+    parser.add_argument('--quick', action='store_true', help='fewer iterations, for smoke testing')
+    parser.add_argument('--only', choices=['micro', 'stress'], help='run just one group of benchmarks')
+    args = parser.parse_args()
+
+    results = {}
+    if args.only != 'stress':
+        results.update(micro_benchmarks(number=100 if args.quick else 1000, repeat=3 if args.quick else 5))
+    if args.only != 'micro':
+        results.update(stress_benchmarks(frames=20 if args.quick else 120, repeat=2 if args.quick else 3))
+    for name, result in sorted(results.items()):
+        print('{:<48} {:>12.2f} us  (median {:.2f} us)'.format(name, result['min_us'], result['median_us']))
+
+    if args.save:
+        save_baseline(args.save, results)
+        print('saved baseline to ' + args.save)
+    if args.compare:
+        rows = compare(results, load_baseline(args.compare), args.tolerance)
+        regressions = [row for row in rows if row[4]]
+        for name, before, now, ratio, regressed in rows:
+            print('{:<48} {:>10.2f} -> {:>10.2f} us  x{:.2f}{}'.format(name, before, now, ratio,
+                                                                       '  REGRESSION' if regressed else ''))
+        if regressions:
+            print('{} regression(s) over {:.0%}'.format(len(regressions), args.tolerance))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+from time import perf_counter
+import json
+import platform
+import statistics
+import pygame
+
+
+def measure(func, number, repeat=5):
+    # time func over repeat batches of number calls, in microseconds per call
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        times.append((perf_counter() - start) / number * 1e6)
+    return {
+        'min_us': min(times),
+        'median_us': statistics.median(times),
+        'number': number,
+        'repeat': repeat
+    }
+
+
+def environment():
+    # details of the machine the results came from
+    return {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform()
+    }
+
+
+def save_baseline(path, results):
+    # write results as a baseline file
+    with open(path, 'w') as outfile:
+        json.dump({'environment': environment(), 'results': results}, outfile, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    # read the results of a baseline file
+    with open(path, 'r') as infile:
+        return json.load(infile)['results']
+
+
+def compare(results, baseline, tolerance=0.25):
+    # compare min times to a baseline, returns (name, baseline us, current us, ratio, regressed) rows
+    rows = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        before, now = baseline[name]['min_us'], result['min_us']
+        ratio = now / before if before else float('inf')
+        rows.append((name, before, now, ratio, ratio > 1 + tolerance))
+    return rows
@@ -0,0 +1,175 @@
+from itertools import cycle
+from animate import Animate
+from animationScheduler import animation_scheduler
+from benchmarks.harness import measure
+from gameClock import game_clock
+from items import FireBall
+from sweepAndPrune import SweepAndPrune
+from game import Game
+
+MAPS = ('world1', 'world1_under')
+STRESS_FRAMES = 120
+
+
+class ShiftedObject:
+    # copy of a tmx map object moved along the x axis
+    def __init__(self, obj, dx):
+        self.name = obj.name
+        self.x, self.y = obj.x + dx, obj.y
+        self.width, self.height = obj.width, obj.height
+        self.image = obj.image
+        self.properties = obj.properties
+
+
+def make_game(map_name='world1'):
+    # a headless game on the given map, ready to update
+    game = Game(headless=True)
+    if map_name != 'world1':
+        game.init_world(map_name=map_name)
+    game.new_game()
+    game_clock.reset()
+    return game
+
+
+def rebuild_world(game):
+    # rebuild the game objects from the (modified) map data without reloading the map file
+    game.map_group.empty()
+    game.init_game_objects()
+    game.prep_enemies()
+    game.mario.reset(game.map_layer, game.game_objects)
+    game.map_group.add(game.mario)
+
+
+def replicate(game, layer_names, copies, spacing):
+    # add shifted copies of every object in the given map layers
+    for name in layer_names:
+        layer = game.retrieve_map_data(name)
+        originals = list(layer)
+        for num in range(1, copies):
+            layer.extend(ShiftedObject(obj, num * spacing) for obj in originals)
+
+
+def many_enemies(factor=10, spacing=48):
+    # every enemy spawn repeated, a little apart from each other, or a whole map apart if spacing is None
+    game = make_game()
+    if spacing is None:
+        spacing = game.tmx_data.width * game.tmx_data.tilewidth
+    replicate(game, ['enemy-spawns'], factor, spacing)
+    rebuild_world(game)
+    return game
+
+
+def enemy_crowd(factor=100):
+    # every enemy spawn repeated on top of itself, with mario among them so they all walk
+    game = make_game()
+    replicate(game, ['enemy-spawns'], factor, 1)
+    rebuild_world(game)
+    game.mario.rect.x = min(enemy.rect.x for enemy in game.game_objects['goomba']) + 100
+    return game
+
+
+def friendly_collisions(game, sweep=None):
+    # every enemy checks whether it bumped into another one, through the sweep if given
+    goombas, koopas = game.game_objects['goomba'], game.game_objects['koopa']
+    if sweep:
+        sweep.update(goombas, koopas)
+    for group in (goombas, koopas):
+        for enemy in group.sprites():
+            enemy.goombas, enemy.koopas, enemy.sweep = goombas, koopas, sweep
+            enemy.check_friendly_collision()
+
+
+def walk_enemies(game):
+    # move every enemy one frame the way their update does
+    for goomba in game.game_objects['goomba'].sprites():
+        if not goomba.dead:     # dead goombas only play their death animation
+            goomba.walk()
+    for koopa in game.game_objects['koopa'].sprites():
+        koopa.walk()
+
+
+def long_map(factor=10):
+    # world1 repeated end to end
+    game = make_game()
+    width = game.tmx_data.width * game.tmx_data.tilewidth
+    replicate(game, ['walls', 'blocks', 'q-blocks', 'pipes', 'coins', 'enemy-spawns', 'decorations', 'flag'],
+              factor, width)
+    game.tmx_data.width *= factor
+    rebuild_world(game)
+    return game
+
+
+def many_fireballs(count=100):
+    # fireballs spread in front of mario, bouncing along the ground
+    game = make_game()
+    controller = game.mario.fireball_controller
+    for num in range(count):
+        speed = 5 if num % 2 else -5
+        fireball = FireBall(game.mario.rect.x + (num % 20) * 10, game.mario.rect.y - (num // 20) * 20,
+                            controller.fb_images, controller.exp_images, controller.obstacles, controller.floor,
+                            controller.goomba, controller.koopa, speed=speed)
+        controller.fireballs.add(fireball)
+        game.map_group.add(fireball)
+    return game
+
+
+def micro_benchmarks(number=1000, repeat=5):
+    # the per call cost of the collision, animation, hud and draw hot paths
+    results = {}
+    for map_name in MAPS:
+        game = make_game(map_name)
+        mario = game.mario
+        results[map_name + '/mario.check_mario_x_collisions'] = measure(mario.check_mario_x_collisions,
+                                                                       number, repeat)
+        results[map_name + '/mario.check_fall'] = measure(mario.check_fall, number, repeat)
+        results[map_name + '/mario.adjust_mario_position'] = measure(mario.adjust_mario_position, number, repeat)
+        block = next(iter(game.game_objects['blocks']), None)
+        if block:
+            results[map_name + '/coin_block.check_hit'] = measure(lambda: block.check_hit(other=mario),
+                                                                  number, repeat)
+        goomba = next(iter(game.game_objects['goomba']), None)
+        if goomba:
+            results[map_name + '/enemy.check_floor'] = measure(goomba.check_floor, number, repeat)
+        results[map_name + '/pyscroll_group.draw'] = measure(lambda: game.map_group.draw(game.screen),
+                                                             max(number // 10, 1), repeat)
+        if goomba:
+            mario.rect.midbottom = goomba.rect.centerx, goomba.rect.top + 5     # landing on it
+            results[map_name + '/enemy.check_player_collision'] = measure(goomba.check_player_collision,
+                                                                          number, repeat)
+    animator = Animate(['images/Coin-1.png', 'images/Coin-2.png', 'images/Coin-3.png', 'images/Coin-4.png'])
+    results['animate.get_image'] = measure(animator.get_image, number, repeat)
+    results['animation_scheduler.update'] = measure(animation_scheduler.update, number, repeat)
+    hud = cycle([('12345', '12', '1-1', '321', '3'), ('12445', '13', '1-2', '320', '2')])    # every number changes
+    results['game_stats.update'] = measure(lambda: game.stats.update(*next(hud)), number, repeat)
+    results['game_stats.update_unchanged'] = measure(lambda: game.stats.update('12445', '13', '1-2', '320', '2'),
+                                                     number, repeat)
+    for factor in (2, 5, 10, 20, 40):
+        game = many_enemies(factor, spacing=None)     # same crowding, longer level
+        count = len(game.game_objects['goomba']) + len(game.game_objects['koopa'])
+        results['enemies.friendly_all_pairs/{}'.format(count)] = measure(lambda: friendly_collisions(game),
+                                                                          max(number // 100, 1), repeat)
+        sweep = SweepAndPrune()
+        results['enemies.friendly_sweep/{}'.format(count)] = measure(lambda: friendly_collisions(game, sweep),
+                                                                      max(number // 100, 1), repeat)
+    for factor in (10, 100):
+        game = enemy_crowd(factor)
+        count = len(game.game_objects['goomba']) + len(game.game_objects['koopa'])
+        results['enemies.walk/{}'.format(count)] = measure(lambda: walk_enemies(game), max(number // 100, 1),
+                                                           repeat)
+    return results
+
+
+def stress_benchmarks(frames=STRESS_FRAMES, repeat=3):
+    # the cost of a whole Game.update frame in normal and scaled up levels
+    scenarios = {
+        'frame/world1': make_game,
+        'frame/world1_under': lambda: make_game('world1_under'),
+        'frame/enemies_x10': many_enemies,
+        'frame/fireballs_100': many_fireballs,
+        'frame/long_map_x10': long_map
+    }
+    results = {}
+    for name, setup in scenarios.items():
+        game = setup()
+        results[name] = measure(game.update, frames, repeat)
+    return results
@@ -1,8 +1,8 @@
 from animate import Animate
+from assetCache import asset_cache
+from soundBank import sound_bank
 from coins import Coin
 from items import Mushroom, FireFlower, StarMan, OneUp
-from pygame import image
-from pygame import mixer
 from pygame.sprite import Sprite
 
 
@@ -52,15 +52,17 @@ class CoinBlock(Block):
     MOVE_DOWN_STATE = 'move-down'
 
     def __init__(self, x, y, initial_image, screen, map_group, rubble_group=None, coins=0, allow_hits=False,
-                 sound=None):
+                 sound=None, grid=None):
         super(CoinBlock, self).__init__(x, y, initial_image, screen)
         self.coin_counter = int(coins)
-        self.blank_img = image.load('images/super-mario-empty-block.png') if self.coin_counter > 0 else None
+        self.blank_img = asset_cache.load_image('images/super-mario-empty-block.png') if self.coin_counter > 0 \
+            else None
         self.coins = []
-        self.sound = sound if sound else mixer.Sound('audio/Coin.wav')
-        self.break_sound = mixer.Sound('audio/Break-block.wav')
+        self.sound = sound if sound else sound_bank.load('audio/Coin.wav')
+        self.break_sound = sound_bank.load('audio/Break-Block.wav')
         self.map_group = map_group
         self.rubble_group = rubble_group
+        self.grid = grid    # spatial grid to keep up to date when the block moves or breaks
         self.allow_hits = allow_hits
         self.state = {
             'meta': CoinBlock.STD_STATE,
@@ -77,7 +79,14 @@ class CoinBlock(Block):
     def coin_block_from_tmx_obj(cls, obj, screen, map_group, game_objects):
         # creates coinblock from tmx
         return cls(obj.x, obj.y, obj.image, screen, map_group, coins=obj.properties.get('coins', 0),
-                   allow_hits=obj.properties.get('allow_hits', False), rubble_group=game_objects['rubble'])
+                   allow_hits=obj.properties.get('allow_hits', False), rubble_group=game_objects['rubble'],
+                   grid=game_objects['collide_grid'])
+
+    def kill(self):
+        # remove block from the spatial grid along with its groups
+        if self.grid is not None:
+            self.grid.remove(self)
+        super(CoinBlock, self).kill()
 
     def set_blank(self):
         # sets the block to be blank
@@ -108,7 +117,7 @@ class CoinBlock(Block):
                     self.sound.play()
                     return n_coin.points
                 elif self.rubble_group is not None and other.state_info['big']:
-                    rubble_img = image.load('images/super-mario-bricks-rubble.png')
+                    rubble_img = asset_cache.load_image('images/super-mario-bricks-rubble.png')
                     speeds = [(-15, 5), (-10, 5), (10, 5), (15, 5)]
                     for speed in speeds:
                         rubble = BlockRubble(self.rect.x, self.rect.y, rubble_img, speed[0], speed[1], self.screen)
@@ -146,6 +155,8 @@ class CoinBlock(Block):
                     self.state['meta'] = CoinBlock.STD_STATE
                 else:
                     self.rect.top -= self.speed
+            if self.grid is not None:
+                self.grid.move(self)
         if self.state['blank'] and self.blank_img:
             self.image = self.blank_img
         self.update_coins()
@@ -173,10 +184,11 @@ class QuestionBlock(CoinBlock):
         else:
             self.item = None
             coins = 1
-        super(QuestionBlock, self).__init__(x, y, initial_image, screen, map_group, coins=coins if coins else 0)
+        super(QuestionBlock, self).__init__(x, y, initial_image, screen, map_group, coins=coins if coins else 0,
+                                            grid=game_objects['collide_grid'])
         if self.item:
-            self.sound = mixer.Sound('audio/Powerup-Appear.wav')
-        self.blank_img = image.load('images/super-mario-empty-block.png')  # force blank image
+            self.sound = sound_bank.load('audio/Powerup-Appear.wav')
+        self.blank_img = asset_cache.load_image('images/super-mario-empty-block.png')  # force blank image
         self.state['blank'] = False
 
     @classmethod
@@ -190,7 +202,7 @@ class QuestionBlock(CoinBlock):
     def check_hit(self, other):
         points = super(QuestionBlock, self).check_hit(other)
         if self.item and self.state['meta'] == CoinBlock.HIT_STATE:
-            obstacles, floor = self.game_objects['collide_objs'], self.game_objects['floors']
+            obstacles, floor = self.game_objects['collide_grid'], self.game_objects['floor_map']
             if self.item == QuestionBlock.MUSHROOM and not other.state_info['big']:
                 n_item = Mushroom(self.rect.x, self.rect.y, obstacles, floor, rise_from=self)
             elif self.item == QuestionBlock.ONE_UP:
@@ -0,0 +1,102 @@
+from collections import namedtuple
+from pygame import Rect
+
+# a solid that stopped a move and the (x, y) normal of the face that was hit, (0, -1) is landing on top
+Contact = namedtuple('Contact', ['solid', 'normal'])
+
+
+def get_rect(solid):
+    # solids are sprites or plain Rects
+    return getattr(solid, 'rect', solid)
+
+
+def solids_near(rect, dx, dy, *grids):
+    # everything in the grids the rect could touch on its way dx, dy from where it is,
+    # one indexed query per grid for the whole move
+    area = rect.union(rect.move(dx, dy))
+    solids = []
+    for grid in grids:
+        solids.extend(grid.query(area))
+    return solids
+
+
+def sweep_x(rect, dx, solids):
+    # how far the rect can move dx before its leading edge meets a solid, and the contact if it does,
+    # solids the rect is already inside are ignored so it can always get back out of them
+    hit = None
+    direction = 1 if dx > 0 else -1
+    for solid in solids:
+        other = get_rect(solid)
+        if not (other.top < rect.bottom and rect.top < other.bottom):
+            continue
+        if direction > 0:
+            gap = other.left - rect.right
+            if 0 <= gap < dx:
+                dx, hit = gap, solid
+        else:
+            gap = other.right - rect.left
+            if dx < gap <= 0:
+                dx, hit = gap, solid
+    if hit is None:
+        return dx, None
+    return dx, Contact(hit, (-direction, 0))
+
+
+def sweep_y(rect, dy, solids):
+    # how far the rect can move dy before it meets a solid, and the contact if it does, anything
+    # moving down lands on solids whose top is below its own, so a rect sunk into a floor is put back on it
+    hit = None
+    direction = 1 if dy > 0 else -1
+    for solid in solids:
+        other = get_rect(solid)
+        if not (other.left < rect.right and rect.left < other.right):
+            continue
+        if direction > 0:
+            gap = other.top - rect.bottom
+            if rect.top < other.top and gap < dy:
+                dy, hit = gap, solid
+        else:
+            gap = other.bottom - rect.top
+            if dy < gap <= 0:
+                dy, hit = gap, solid
+    if hit is None:
+        return dy, None
+    return dy, Contact(hit, (0, -direction))
+
+
+def move(rect, dx, dy, *grids):
+    # moves the rect dx then dy, stopping at the first solid in the grids on each axis so nothing
+    # fast can pass through a wall between frames, returns the contacts made on the way
+    contacts = []
+    if not dx and not dy:
+        return contacts
+    solids = solids_near(rect, dx, dy, *grids)
+    if dx:
+        dx, contact = sweep_x(rect, dx, solids)
+        rect.x += dx
+        if contact:
+            contacts.append(contact)
+    if dy:
+        dy, contact = sweep_y(rect, dy, solids)
+        rect.y += dy
+        if contact:
+            contacts.append(contact)
+    return contacts
+
+
+def ground(rect, grid, floor):
+    # top of the solid the rect is standing on or sunk into, putting the rect on it, or None if there isn't
+    # one, floors are read from the floor map's columns under its edges and middle so only blocks need a query
+    dy, found = 1, False
+    for x in (rect.left, rect.centerx, rect.right - 1):
+        top = floor.floor_top(x, rect.top, rect.bottom)
+        if top is not None and rect.top < top and top - rect.bottom < dy:
+            dy, found = top - rect.bottom, True
+    if dy:  # not standing right on a floor, so a block may hold it up
+        block_dy, block = sweep_y(rect, 1, grid.query(Rect(rect.left, rect.top, rect.width, rect.height + 1)))
+        if block and block_dy < dy:
+            dy, found = block_dy, True
+    if found:
+        rect.y += dy
+        return rect.bottom
+    return None
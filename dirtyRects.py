@@ -0,0 +1,79 @@
+from collections import deque
+import pygame
+
+
+class DirtyRectRenderer:
+    # sends only the parts of the screen that changed to the display instead of flipping the
+    # whole window, falling back to a full flip whenever the camera moves
+    def __init__(self, screen, enabled=False, window=300):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.enabled = enabled
+        self.view = None        # camera position and mode the last frame was drawn with
+        self.drawn = {}         # sprite -> (screen rect, image) as last drawn
+        self.rects = []         # changed screen areas this frame
+        self.full = True
+        self.fractions = deque(maxlen=window)   # fraction of the screen pushed, one per frame
+        self.full_frames = 0
+
+    def mark(self, rect):
+        # a screen area that changed this frame
+        if self.enabled and rect:
+            self.rects.append(pygame.Rect(rect))
+
+    def track_view(self, view):
+        # anything that moves the whole picture, like the camera scrolling, needs a full flip
+        if self.enabled and view != self.view:
+            self.view = view
+            self.full = True
+
+    def track_sprites(self, sprites, view_rect):
+        # mark where map sprites moved, changed image, appeared or disappeared since last frame
+        if not self.enabled:
+            return
+        scale_x = self.screen_rect.width / view_rect.width
+        scale_y = self.screen_rect.height / view_rect.height
+        drawn = {}
+        for sprite in sprites:
+            rect = sprite.rect
+            if not rect.colliderect(view_rect):
+                continue
+            width, height = sprite.image.get_size()     # images are drawn at the rect's corner at full size
+            screen_rect = pygame.Rect(int((rect.x - view_rect.x) * scale_x) - 1,
+                                      int((rect.y - view_rect.y) * scale_y) - 1,
+                                      int(width * scale_x) + 3, int(height * scale_y) + 3)
+            drawn[sprite] = screen_rect, sprite.image
+            last = self.drawn.pop(sprite, None)
+            if last != (screen_rect, sprite.image):
+                self.rects.append(screen_rect)
+                if last:
+                    self.rects.append(last[0])
+        self.rects.extend(rect for rect, image in self.drawn.values())  # sprites that are gone
+        self.drawn = drawn
+
+    def present(self):
+        # update the display with what changed this frame
+        if not self.enabled:
+            pygame.display.flip()
+            return
+        if self.full:
+            pygame.display.flip()
+            self.full_frames += 1
+            self.fractions.append(1.0)
+        else:
+            rects = [rect.clip(self.screen_rect) for rect in self.rects]
+            if rects:
+                pygame.display.update(rects)
+            area = sum(rect.width * rect.height for rect in rects)
+            self.fractions.append(min(area / (self.screen_rect.width * self.screen_rect.height), 1.0))
+        self.rects = []
+        self.full = False
+
+    def stats(self):
+        # how much of the screen was pushed to the display over the last few hundred frames
+        count = len(self.fractions)
+        return {
+            'mean_fraction': sum(self.fractions) / count if count else 0.0,
+            'last_fraction': self.fractions[-1] if count else 0.0,
+            'full_frames': self.full_frames
+        }
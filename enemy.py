@@ -1,6 +1,7 @@
-import pygame
 from animate import Animate
+from assetCache import asset_cache
 from pygame.sprite import Sprite
+from gameClock import game_clock
 
 ENEMY_DIRECTION = -1
 ENEMY_GRAVITY = 4
@@ -8,7 +9,7 @@ ENEMY_SPEED = 2
 
 
 class Enemy(Sprite):
-    def __init__(self, screen, image, x, y, player, floor, block, goombas, koopas):
+    def __init__(self, screen, image, x, y, player, floor, block, goombas, koopas, sweep=None):
         super().__init__()
         self.screen = screen
         self.screen_rect = self.screen.get_rect()
@@ -17,10 +18,11 @@ class Enemy(Sprite):
         self.x, self.y = x, y
         self.rect.left, self.rect.top = self.x, self.y
         self.player = player
-        self.floor = floor
-        self.block = block
+        self.floor = floor  # floor map of floor rects
+        self.block = block  # spatial grid of blocks and pipes
         self.goombas = goombas
         self.koopas = koopas
+        self.sweep = sweep  # broad phase that narrows down which enemies can touch this one
         self.death_animation_frame = 0
         self.last_frame = 0
 
@@ -46,39 +48,40 @@ class Enemy(Sprite):
     @staticmethod
     def img_file(name, length, width):
         file = 'images/' + name + '.png'
-        file = pygame.image.load(file)
-        file = pygame.transform.scale(file, (length, width))
-        return file
+        return asset_cache.load_image(file, scale=(length, width))
 
     def check_player_collision(self):
         # checks for collision with Mario
-        if self.rect.colliderect(self.player.rect):
-            # pts = [self.rect.topleft, self.rect.midtop, self.rect.topright]
-            pts = []
-            x, y = self.rect.topleft
-            limitx, limity = self.rect.topright
-            for point in range(x, limitx):
-                pts.append((x, y))
-            for pt in pts:
-                if self.rect.collidepoint(pt) and self.rect.left < self.player.rect.centerx < self.rect.right:
-                    self.set_killed()
+        player = self.player.rect
+        if self.rect.colliderect(player):
+            if self.stomped(self.rect, player, self.player.y_vel):
+                self.set_killed()
             self.enemy_player_collide_flag = True
             return True
 
+    @staticmethod
+    def stomped(enemy, player, y_vel):
+        # Mario's centre is over the enemy rect and he isn't jumping up into it from underneath
+        if not enemy.left < player.centerx < enemy.right:
+            return False
+        return y_vel >= 0 or player.top <= enemy.top
+
     def set_killed(self):
         # if collision detected set dead to true
         self.player_enemy_kill = True
-        self.last_frame = pygame.time.get_ticks()
+        self.last_frame = game_clock.get_ticks()
         self.shell_mode = True
         self.dead = True
 
     def check_block_collision(self):
         # Check if colliding with map (i.e pipe) or dying from block
-        if pygame.sprite.spritecollideany(self, self.block):
-            self.enemy_block_collide_flag = True
-            self.ENEMY_DIRECTION *= -1
-            return True
-        for block_rect in self.block:
+        nearby = self.block.query(self.rect)
+        for block_rect in nearby:
+            if self.rect.colliderect(block_rect.rect):
+                self.enemy_block_collide_flag = True
+                self.ENEMY_DIRECTION *= -1
+                return True
+        for block_rect in nearby:
             if self.rect.contains(block_rect.rect):
                 self.ENEMY_DIRECTION = abs(self.ENEMY_DIRECTION) * -1
                 self.enemy_block_collide_flag = True
@@ -88,13 +91,16 @@ class Enemy(Sprite):
 
     def check_friendly_collision(self):
         # Check for collisions with friendly or koopa shell
-        for goomba_rect in self.goombas:
-            if goomba_rect is not self and self.rect.colliderect(goomba_rect.rect) and not goomba_rect.dead:
+        nearby = self.sweep.nearby(self) if self.sweep else None
+        goombas, koopas = nearby or (self.goombas, self.koopas)
+        for goomba_rect in goombas:
+            if goomba_rect is not self and self.rect.colliderect(goomba_rect.rect) and not goomba_rect.dead \
+                    and goomba_rect.alive():    # swept enemies can be killed later in the frame
                 self.enemy_goomba_collide_flag = True
                 self.ENEMY_DIRECTION *= -1
                 return True
-        for koopa_rect in self.koopas:
-            if koopa_rect is not self and self.rect.colliderect(koopa_rect.rect):
+        for koopa_rect in koopas:
+            if koopa_rect is not self and self.rect.colliderect(koopa_rect.rect) and koopa_rect.alive():
                 if koopa_rect.shell_movement:
                     self.shell_enemy_kill = True
                 self.enemy_koopa_collide_flag = True
@@ -103,10 +109,9 @@ class Enemy(Sprite):
 
     def check_floor(self):
         # Returns true if at enemy on floor
-        for floor_rect in self.floor:
-            if self.rect.colliderect(floor_rect):
-                return True
-        for block in self.block:
+        if self.floor.overlaps(self.rect):
+            return True
+        for block in self.block.query(self.rect):
             pts = [block.rect.topleft, block.rect.midtop, block.rect.topright]
             for pt in pts:
                 if self.rect.collidepoint(pt):
@@ -124,6 +129,16 @@ class Enemy(Sprite):
             self.dead = True
             self.kill()
 
+    def walk(self):
+        # move along the floor, or fall if there isn't any
+        self.check_boundary()
+        # If no blocks are touching enemy -> Fall Down
+        if not self.check_floor() and self.start_movement:
+            self.rect.y += (abs(self.ENEMY_DIRECTION) * self.ENEMY_GRAVITY)
+            self.rect.x = self.rect.x + (self.ENEMY_DIRECTION * (self.ENEMY_SPEED - 1))
+        if self.check_floor() and self.start_movement:
+            self.rect.x = self.rect.x + (self.ENEMY_DIRECTION * self.ENEMY_SPEED)
+
     def check_collisions(self):
         # If flag is set already, no need to check collisions again
         # Also might stops from getting multiple flags set off
@@ -155,7 +170,7 @@ class Enemy(Sprite):
 
 
 class Goomba(Enemy):
-    def __init__(self, screen, x, y, player, floor, block, goombas, koopas):
+    def __init__(self, screen, x, y, player, floor, block, goombas, koopas, sweep=None):
         self.walk_images = ['images/GoombaLeftBoot.png',
                             'images/GoombaRightBoot.png']
         self.upside_down_images = ['images/GoombaUD1.png',
@@ -163,10 +178,10 @@ class Goomba(Enemy):
         self.crushed_images = ['images/GoombaCrushed.png']
         self.animator = Animate(self.walk_images)
         image = self.animator.get_image()
-        super().__init__(screen, image, x, y, player, floor, block, goombas, koopas)
+        super().__init__(screen, image, x, y, player, floor, block, goombas, koopas, sweep)
 
     def crushed_death_animation(self):
-        time = pygame.time.get_ticks()
+        time = game_clock.get_ticks()
         # Animate and keep on screen for half a second before killing sprite
         self.animator = Animate(self.crushed_images)
         if abs(time - self.last_frame) > 1000:
@@ -174,7 +189,7 @@ class Goomba(Enemy):
             self.kill()
 
     def upside_down_death_animation(self):
-        time = pygame.time.get_ticks()
+        time = game_clock.get_ticks()
         # Animate getting hit (Go up for two seconds)
         if self.death_animation_frame == 0:
             self.rect.y += (abs(self.ENEMY_DIRECTION) * self.ENEMY_SPEED)
@@ -202,13 +217,7 @@ class Goomba(Enemy):
         self.image = self.animator.get_image()
 
     def goomba_physics(self):
-        self.check_boundary()
-        # If no blocks are touching enemy -> Fall Down
-        if not self.check_floor() and self.start_movement:
-            self.rect.y += (abs(self.ENEMY_DIRECTION) * self.ENEMY_GRAVITY)
-            self.rect.x = self.rect.x + (self.ENEMY_DIRECTION * (self.ENEMY_SPEED - 1))
-        if self.check_floor() and self.start_movement:
-            self.rect.x = self.rect.x + (self.ENEMY_DIRECTION * self.ENEMY_SPEED)
+        self.walk()
 
         # print('Player ' + str(self.check_player_collision()))
         # print('Block ' + str(self.check_block_collision()))
@@ -220,7 +229,7 @@ class Goomba(Enemy):
                 # Enemy dead
                 if self.player_enemy_kill:
                     self.dead = True
-                    self.last_frame = pygame.time.get_ticks()
+                    self.last_frame = game_clock.get_ticks()
                     self.crushed_death_animation()
                 else:
                     self.enemy_player_collide_flag = False
@@ -251,7 +260,7 @@ class Goomba(Enemy):
 
 
 class Koopa(Enemy):
-    def __init__(self, screen, x, y, player, floor, block, goombas, koopas):
+    def __init__(self, screen, x, y, player, floor, block, goombas, koopas, sweep=None):
         self.name_1, self.name_2 = None, None
         self.name_1 = Enemy.img_file('KoopaWalkLeft_1', 25, 40)
         self.name_2 = Enemy.img_file('KoopaWalkLeft_2', 25, 40)
@@ -269,13 +278,13 @@ class Koopa(Enemy):
         self.feet_images = [self.name_1]
         self.animator = Animate(self.left_images)
         image = self.animator.get_image()
-        super().__init__(screen, image, x, y, player, floor, block, goombas, koopas)
+        super().__init__(screen, image, x, y, player, floor, block, goombas, koopas, sweep)
         self.collision_flag = False
         self.feet_frame = 0
         self.counter = 0
 
     def upside_down_death_animation(self):
-        time = pygame.time.get_ticks()
+        time = game_clock.get_ticks()
         # Animate getting hit (Go up for two seconds)
         if self.death_animation_frame == 0:
             self.rect.y += (abs(self.ENEMY_DIRECTION) * self.ENEMY_SPEED)
@@ -300,20 +309,14 @@ class Koopa(Enemy):
             return True
 
     def koopa_physics(self):
-        self.check_boundary()
-
-        if not self.check_floor() and self.start_movement:
-            self.rect.y += (abs(self.ENEMY_DIRECTION) * self.ENEMY_GRAVITY)
-            self.rect.x = self.rect.x + (self.ENEMY_DIRECTION * (self.ENEMY_SPEED - 1))
-        if self.check_floor() and self.start_movement:
-            self.rect.x = self.rect.x + (self.ENEMY_DIRECTION * self.ENEMY_SPEED)
+        self.walk()
 
         # If collision
         if self.check_collisions():
             # Gets stomped on -> stop
             # Collides with player when in shell -> Movement
             if self.enemy_player_collide_flag and self.shell_mode:
-                time = pygame.time.get_ticks()
+                time = game_clock.get_ticks()
                 # Only put in shell if needed
                 if self.death_animation_frame == 0:
                     self.animator = Animate(self.death_images)
@@ -344,7 +347,7 @@ class Koopa(Enemy):
                         self.shell_movement:
                     if self.counter == 0:
                         self.animator = Animate(self.feet_images)
-                        self.feet_frame = pygame.time.get_ticks()
+                        self.feet_frame = game_clock.get_ticks()
                         self.counter += 1
                     if abs(self.feet_frame - time) > 3000:
                         self.counter = 0
@@ -4,8 +4,9 @@ from sys import exit
 
 class EventLoop:
     # logic for game
-    def __init__(self, loop_running=False, actions=None, extra_actions=None):
+    def __init__(self, loop_running=False, actions=None, extra_actions=None, events=None):
         self.action_map = {pygame.QUIT: exit, }
+        self.events = events if events else pygame.event.get     # where events come from
         if isinstance(actions, dict):
             self.action_map.update(actions)     # add custom actions, if provided
         self.additional = extra_actions
@@ -13,7 +14,7 @@ class EventLoop:
 
     def check_events(self):
         # checks event
-        for event in pygame.event.get():
+        for event in self.events():
             if event.type == pygame.QUIT:
                 self.action_map[event.type]()   # quit game with no argument passed
             elif event.type in self.action_map:
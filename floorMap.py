@@ -0,0 +1,69 @@
+from array import array
+from bisect import bisect_right
+from spatialGrid import SpatialGrid
+
+NO_FLOOR = 2 ** 31 - 1  # column value for a gap in the floor
+
+
+class FloorMap(SpatialGrid):
+    # static floor geometry from the map's "walls" layer, compiled into per pixel column
+    # arrays so ground and gap checks are a lookup instead of a scan over every floor rect
+    def __init__(self, width, cell_size=32):
+        super(FloorMap, self).__init__(cell_size)
+        self.width = width
+        self.tops = array('i', [NO_FLOOR]) * width      # top of the highest floor in each column
+        self.bottoms = array('i', [NO_FLOOR]) * width   # bottom of the highest floor in each column
+        self.stacked = {}   # column -> sorted (top, bottom) spans, only for columns with several floors
+        self.spans = {}     # (top, height, width) -> (starts, ends) of left edges that overlap a floor
+
+    def add(self, rect):
+        # index the floor rect and compile it into the columns strictly inside its left and right edges
+        super(FloorMap, self).add(rect)
+        self.spans.clear()
+        for x in range(max(rect.left + 1, 0), min(rect.right, self.width)):
+            if self.tops[x] == NO_FLOOR:
+                self.tops[x], self.bottoms[x] = rect.top, rect.bottom
+                continue
+            spans = self.stacked.get(x, [(self.tops[x], self.bottoms[x])])
+            spans.append((rect.top, rect.bottom))
+            spans.sort()
+            self.stacked[x] = spans
+            self.tops[x], self.bottoms[x] = spans[0]
+
+    def floor_top(self, x, top, bottom):
+        # top of the first floor in column x that something spanning top to bottom is standing on or sunk into
+        if not 0 <= x < self.width:
+            return None
+        spans = self.stacked.get(x)
+        if spans is None:
+            if self.tops[x] <= bottom and top < self.bottoms[x]:
+                return self.tops[x]
+            return None
+        for span_top, span_bottom in spans:
+            if span_top <= bottom and top < span_bottom:
+                return span_top
+        return None
+
+    def floor_spans(self, top, height, width):
+        # ranges of left edges where a rect of this size at this height overlaps a floor rect,
+        # floors never move so each size and height is worked out once per level
+        key = top, height, width
+        spans = self.spans.get(key)
+        if spans is None:
+            ranges = sorted((entry[1].left - width + 1, entry[1].right - 1) for entry in self.entries.values()
+                            if entry[1].top < top + height and top < entry[1].bottom)
+            merged = []
+            for start, end in ranges:
+                if merged and start <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            spans = self.spans[key] = (array('i', [start for start, end in merged]),
+                                       array('i', [end for start, end in merged]))
+        return spans
+
+    def overlaps(self, rect):
+        # true if the rect overlaps any floor rect, one bisect into the spans for its size and height
+        starts, ends = self.floor_spans(rect.top, rect.height, rect.width)
+        span = bisect_right(starts, rect.left) - 1
+        return span >= 0 and rect.left <= ends[span]
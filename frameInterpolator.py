@@ -0,0 +1,56 @@
+class FrameInterpolator:
+    # draws sprites and the camera part way between where they were before and after the last physics
+    # step, so motion stays smooth when frames are drawn more or less often than the physics runs
+    def __init__(self, snap_distance=64):
+        self.snap_distance = snap_distance  # moves bigger than this in one step are teleports, not motion
+        self.sprites = {}   # sprite -> rect topleft before the last step
+        self.camera = None  # (map layer, view centre) before the last step
+        self.drawn = []     # (sprite, real topleft) of sprites moved for the frame being drawn
+        self.view = None    # (map layer, real view centre) if the camera was moved for the frame being drawn
+
+    def save(self, sprites, map_layer):
+        # remember where everything is before a physics step
+        self.sprites = {sprite: sprite.rect.topleft for sprite in sprites}
+        self.camera = map_layer, map_layer.view_rect.center
+
+    def clear(self):
+        # forget the saved positions, the next frame is drawn where everything really is
+        self.sprites = {}
+        self.camera = None
+
+    def blend(self, start, end, alpha):
+        # point alpha of the way from start to end, or None if it is too far to be smooth motion
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        if abs(dx) > self.snap_distance or abs(dy) > self.snap_distance:
+            return None
+        return round(start[0] + dx * alpha), round(start[1] + dy * alpha)
+
+    def apply(self, sprites, map_layer, alpha):
+        # move the sprites and camera to where they were alpha of the way through the last step
+        for sprite in sprites:
+            start = self.sprites.get(sprite)
+            if start is None:
+                continue    # new this step
+            end = sprite.rect.topleft
+            if start == end:
+                continue
+            point = self.blend(start, end, alpha)
+            if point:
+                self.drawn.append((sprite, end))
+                sprite.rect.topleft = point
+        if self.camera and self.camera[0] is map_layer:
+            end = map_layer.view_rect.center
+            point = self.blend(self.camera[1], end, alpha)
+            if point and point != end:
+                self.view = map_layer, end
+                map_layer.center(point)
+
+    def restore(self):
+        # put everything back where the physics left it
+        for sprite, end in self.drawn:
+            sprite.rect.topleft = end
+        self.drawn = []
+        if self.view:
+            map_layer, end = self.view
+            map_layer.center(end)
+            self.view = None
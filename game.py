@@ -3,18 +3,42 @@ from eventLoop import EventLoop
 from block import Block, CoinBlock, QuestionBlock
 from pipe import Pipe
 from coins import Coin
-from decoration import Decoration
-from maps import load_world_map
+from levelLoader import LevelLoader
+from levelSnapshot import LevelSnapshot
+from activationRegion import ActivationRegion
+from assetCache import asset_cache
+from animationScheduler import animation_scheduler
 from mario import Mario
 from enemy import Goomba, Koopa
 from title import Menu
 from items import Item
 from gameStats import GameStats
+from profiler import FrameProfiler
+from dirtyRects import DirtyRectRenderer
+from frameInterpolator import FrameInterpolator
+from sweepAndPrune import SweepAndPrune
+from soundBank import sound_bank
+import os
+from spatialGrid import SpatialGrid
+from floorMap import FloorMap
+from gameClock import game_clock, REAL_TIME, FAST_FORWARD
 import pygame
 
+MAX_FPS = 240       # cap on frames drawn a second, physics steps are paced by the game clock's fps
+MAX_STEPS = 5       # most physics steps run to catch up before a frame is drawn, past this the game slows
+
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, input_script=None, clock_mode=None, profile=False, dirty_rects=False):
+        if headless:    # no window or sound card, SDL dummy drivers
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+        if not clock_mode:
+            clock_mode = FAST_FORWARD if headless else REAL_TIME
+        game_clock.set_mode(clock_mode)
+        game_clock.reset()
+        self.headless = headless
+        self.input_script = input_script    # scripted or replayed input to use instead of the keyboard
         pygame.init()
         config = ConfigParser()     # parse settings file
         config.read('settings.ini')
@@ -22,8 +46,13 @@ class Game:
                        int(config['screen_settings']['height']))
         self.screen = pygame.display.set_mode(screen_size)
         self.stats = GameStats(self.screen)
+        self.profiler = FrameProfiler(self.screen, enabled=profile)     # per stage frame timings, F3 overlay
+        self.renderer = DirtyRectRenderer(self.screen, enabled=dirty_rects)    # pushes frames to the display
         pygame.display.set_caption(config['game_settings']['title'])
         self.clock = pygame.time.Clock()    # clock for limiting fps
+        self.interpolator = FrameInterpolator()     # draws sprites between physics steps
+        self.level_loader = LevelLoader(self.screen)   # loads levels, prefetching pipe destinations
+        self.next_music = None  # music to switch to once the current frame is done
         self.game_objects = None
         self.tmx_data = None
         self.map_layer = None
@@ -37,8 +66,8 @@ class Game:
         self.lives = 3
         self.coins = 0
         self.SFX = {
-            '1-up': pygame.mixer.Sound('audio/1-Up.wav'),
-            'warning': pygame.mixer.Sound('audio/Time-Warning.wav')
+            '1-up': sound_bank.load('audio/1-Up.wav'),
+            'warning': sound_bank.load('audio/Time-Warning.wav')
         }
         self.init_world()
         self.mario = Mario(self.game_objects, self.map_layer, self.map_group, self.screen)
@@ -47,6 +76,7 @@ class Game:
         self.map_layer.center((self.mario.rect.x, self.mario.rect.y))   # center camera
         self.map_layer.zoom = 0.725     # camera zoom
         self.map_group.add(self.mario)   # add test sprite to map group
+        self.snapshot = LevelSnapshot(self)     # starting state of the level to respawn into
         self.paused = False
         # print(self.map_layer.view_rect.center)
         # action map for event loop
@@ -54,7 +84,7 @@ class Game:
         self.game_active = False
         self.game_won = False
         self.menu = Menu(self.screen)
-        self.action_map = {pygame.KEYDOWN: self.set_paused}
+        self.action_map = {pygame.KEYDOWN: self.check_keydown}
         print(self.map_layer.view_rect.center)
 
     def retrieve_map_data(self, data_layer_name):
@@ -67,9 +97,10 @@ class Game:
 
     def init_world(self, map_name='world1', spawn='player', reset=True):
         # load the world level
-        self.tmx_data, self.map_layer, self.map_group = load_world_map('images/' + map_name + '.tmx', self.screen)
+        self.tmx_data, self.map_layer, self.map_group = self.level_loader.load(map_name)
         self.player_spawn = self.tmx_data.get_object_by_name(spawn)  # get player spawn object from map data
         self.init_game_objects()
+        self.prefetch_destinations()
         self.map_layer.center((self.player_spawn.x, self.player_spawn.y))
         self.map_layer.zoom = 0.725  # camera zoom
         if self.mario:
@@ -78,32 +109,51 @@ class Game:
             self.mario.reset(self.map_layer, self.game_objects, reset)
             self.mario.rect.x, self.mario.rect.y = self.player_spawn.x, self.player_spawn.y
 
+    def prefetch_destinations(self):
+        # get levels mario can reach ready in the background
+        for pipe in self.game_objects['pipes']:
+            if pipe.destination:
+                self.level_loader.prefetch(pipe.destination)
+
+    def respawn(self):
+        # put the starting level back the way it began and mario at its spawn point
+        self.snapshot.restore(self)
+        self.game_objects['active'].reset()
+        self.prefetch_destinations()
+        self.map_layer.center((self.player_spawn.x, self.player_spawn.y))
+        if self.map_layer.zoom != 0.725:    # setting the zoom rebuilds the map buffer
+            self.map_layer.zoom = 0.725
+        self.map_group.add(self.mario)
+        self.mario.reset(self.map_layer, self.game_objects)
+        self.mario.rect.x, self.mario.rect.y = self.player_spawn.x, self.player_spawn.y
+
     def handle_pipe(self):
         # mario going through
-        keys_pressed = pygame.key.get_pressed()
-        if keys_pressed[pygame.K_DOWN] is 1:
+        keys_pressed = self.get_keys()
+        if keys_pressed[pygame.K_DOWN]:
             for pipe in self.game_objects['pipes']:
                 if (pipe.destination and
                         self.mario.rect.left >= pipe.rect.left and self.mario.rect.right <= pipe.rect.right):
-                    self.init_world(map_name=pipe.destination, spawn=pipe.spawn, reset=False)
-                    self.mario.x, self.mario.y = self.player_spawn.x, self.player_spawn.y
-                    pygame.mixer.music.load('audio/' + str(pipe.music))
-                    pygame.mixer.music.play(-1)
-        elif keys_pressed[pygame.K_RIGHT] is 1:
+                    self.enter_pipe(pipe)
+                    return
+        elif keys_pressed[pygame.K_RIGHT]:
             for pipe in self.game_objects['pipes']:
                 if (pipe.destination and pipe.horiz and self.mario.rect.right >= pipe.rect.left and
                         self.mario.rect.bottom <= pipe.rect.bottom):
-                    self.init_world(map_name=pipe.destination, spawn=pipe.spawn, reset=False)
-                    self.mario.x, self.mario.y = self.player_spawn.x, self.player_spawn.y
-                    pygame.mixer.music.load('audio/' + str(pipe.music))
-                    pygame.mixer.music.play(-1)
+                    self.enter_pipe(pipe)
+                    return
+
+    def enter_pipe(self, pipe):
+        # swap in the pipe's destination level, the music changes after the frame is drawn
+        self.init_world(map_name=pipe.destination, spawn=pipe.spawn, reset=False)
+        self.mario.x, self.mario.y = self.player_spawn.x, self.player_spawn.y
+        self.next_music = 'audio/' + str(pipe.music)
 
     def check_stage_clear(self):
         # checks if stage is cleared
         for rect in self.game_objects['win-zone']:
             if rect.colliderect(self.mario.rect):
-                pygame.mixer.music.load('audio/End-Clear-Stage.wav')
-                pygame.mixer.music.play()
+                self.play_music('audio/End-Clear-Stage.wav')
                 self.mario.flag_pole_sliding()
                 self.game_won = True
 
@@ -121,17 +171,24 @@ class Game:
             'items': pygame.sprite.Group(),
             'koopa': pygame.sprite.Group(),
             'goomba': pygame.sprite.Group(),
-            'win-zone': []
+            'win-zone': [],
+            'floor_map': FloorMap(self.tmx_data.width * self.tmx_data.tilewidth,
+                                  self.tmx_data.tilewidth),     # floors compiled by column and map cell
+            'collide_grid': SpatialGrid(self.tmx_data.tilewidth)    # collide_objs indexed by map cell
         }
+        self.game_objects['enemy_sweep'] = SweepAndPrune()     # nearby enemy pairs, found once per frame
+        self.game_objects['active'] = ActivationRegion({name: self.game_objects[name] for name in
+                                                        ('blocks', 'q_blocks', 'coins', 'goomba', 'koopa')})
         floor_data = self.retrieve_map_data('walls')
         block_data = self.retrieve_map_data('blocks')
         q_block_data = self.retrieve_map_data('q-blocks')
         pipe_data = self.retrieve_map_data('pipes')
         coin_data = self.retrieve_map_data('coins')
         flag_data = self.retrieve_map_data('flag')
-        background = self.retrieve_map_data('decorations')
         for obj in floor_data:  # walls represented as pygame Rects
-            self.game_objects['floors'].append(pygame.Rect(obj.x, obj.y, obj.width, obj.height))
+            floor_rect = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
+            self.game_objects['floors'].append(floor_rect)
+            self.game_objects['floor_map'].add(floor_rect)
         for block in block_data:
             if not block.properties.get('pipe', False):
                 b_sprite = CoinBlock.coin_block_from_tmx_obj(block, self.screen, self.map_group, self.game_objects)
@@ -140,11 +197,13 @@ class Game:
             self.map_group.add(b_sprite)    # draw using this group
             self.game_objects['blocks'].add(b_sprite)       # check collisions using this group
             self.game_objects['collide_objs'].add(b_sprite)
+            self.game_objects['collide_grid'].add(b_sprite)
         for q_block in q_block_data:
             q_sprite = QuestionBlock.q_block_from_tmx_obj(q_block, self.screen, self.map_group, self.game_objects)
             self.map_group.add(q_sprite)    # draw using this group
             self.game_objects['q_blocks'].add(q_sprite)     # check collisions using this group
             self.game_objects['collide_objs'].add(q_sprite)
+            self.game_objects['collide_grid'].add(q_sprite)
         for coin in coin_data:
             c_sprite = Coin(coin.x, coin.y, self.screen)
             self.map_group.add(c_sprite)
@@ -154,93 +213,141 @@ class Game:
             self.map_group.add(p_sprite)    # draw using this group
             self.game_objects['pipes'].add(p_sprite)        # check collisions using this group
             self.game_objects['collide_objs'].add(p_sprite)
+            self.game_objects['collide_grid'].add(p_sprite)
         for flag_part in flag_data:
             if flag_part.image:
                 f_sprite = Block(flag_part.x, flag_part.y, flag_part.image, self.screen)
-                self.map_group.add(f_sprite)    # draw using this group
-                self.game_objects['flag'].add(f_sprite)        # check collisions using this group
+                self.game_objects['flag'].add(f_sprite)     # drawn by the map's static layer
             else:
                 self.game_objects['win-zone'].append(pygame.Rect(flag_part.x, flag_part.y,
                                                                  flag_part.width, flag_part.height))
-        for bg in background:
-            self.map_group.add(Decoration(bg.x, bg.y, bg.image))
 
     def prep_enemies(self):
         # prepares the enemy sprites
         enemy_spawn_data = self.retrieve_map_data('enemy-spawns')
+        active = self.game_objects['active']     # enemies only bump into other awake enemies
         for spawn in enemy_spawn_data:
             if spawn.properties.get('e_type', 'goomba') == 'goomba':
                 enemy = Goomba(self.screen, spawn.x, spawn.y, self.mario,
-                               self.game_objects['floors'], self.game_objects['collide_objs'],
-                               self.game_objects['goomba'], self.game_objects['koopa'])
+                               self.game_objects['floor_map'], self.game_objects['collide_grid'],
+                               active.awake['goomba'], active.awake['koopa'],
+                               self.game_objects['enemy_sweep'])
                 enemy.rect.y += 65 - enemy.rect.height
                 self.game_objects['goomba'].add(enemy)
             else:
                 enemy = Koopa(self.screen, spawn.x, spawn.y, self.mario,
-                              self.game_objects['floors'], self.game_objects['collide_objs'],
-                              self.game_objects['goomba'], self.game_objects['koopa'])
+                              self.game_objects['floor_map'], self.game_objects['collide_grid'],
+                              active.awake['goomba'], active.awake['koopa'],
+                              self.game_objects['enemy_sweep'])
                 enemy.rect.y += (65 - enemy.rect.height)
                 print('Enemy rect begin:' + str(enemy.rect.y))
                 self.game_objects['koopa'].add(enemy)
             self.map_group.add(enemy)
+        active.reset()
+
+    def check_keydown(self, event):
+        # in game key presses
+        self.set_paused(event)
+        if event.key == pygame.K_F3:
+            self.profiler.toggle()
 
     def set_paused(self, event):
         # pauses the game
         key = event.key
         if key == pygame.K_p:
             self.paused = not self.paused
-            pygame.mixer.music.load('audio/Pause-Screen.wav')
-            pygame.mixer.music.play()
+            self.play_music('audio/Pause-Screen.wav')
+
+    def get_keys(self):
+        # current key states, from the input script if there is one
+        if self.input_script:
+            return self.input_script.get_pressed()
+        return pygame.key.get_pressed()
+
+    def get_events(self):
+        # pending events, from the input script if there is one
+        if self.input_script:
+            return self.input_script.get_events()
+        return pygame.event.get()
 
     def update(self):
         # updates the screen and objects on the screen
+        self.profiler.start_frame()
+        self.update_world()
+        self.draw()
+
+    def update_world(self):
+        # one physics step of everything in the level
         if not self.paused and self.game_active:
-            for block in self.game_objects['blocks']:
+            active = self.game_objects['active']
+            active.update(self.map_layer.view_rect)     # only update what is near the camera
+            animation_scheduler.update()    # move every animation on to its current frame
+            for block in self.game_objects['collide_grid'].query(self.mario.rect):   # only blocks near mario
                 points = block.check_hit(other=self.mario)
                 if points:
                     self.score += points
                     self.coins += 1
-            for q_block in self.game_objects['q_blocks']:
-                points = q_block.check_hit(other=self.mario)
-                if points:
-                    self.score += points
-                    self.coins += 1
-            for coin in self.game_objects['coins']:
+            self.profiler.lap('blocks')
+            for coin in active.awake['coins'].sprites():
                 if pygame.sprite.collide_rect(coin, self.mario):
                     self.score += coin.points
                     self.coins += 1
                     self.mario.SFX['coin'].play()
                     coin.kill()
-            self.game_objects['blocks'].update()
+            self.profiler.lap('coins')
+            active.awake['blocks'].update()
             self.game_objects['rubble'].update()
             one_up_check = pygame.sprite.spritecollideany(self.mario, self.game_objects['items'])
             if one_up_check and one_up_check.item_type == Item.ONE_UP:
                 self.lives += 1
                 self.SFX['1-up'].play()
                 one_up_check.kill()
-            self.mario.update(pygame.key.get_pressed())  # update and check if not touching any walls
+            self.profiler.lap('items')
+            self.mario.update(self.get_keys())  # update and check if not touching any walls
+            self.profiler.lap('mario')
             self.handle_pipe()
             self.check_stage_clear()
+            self.profiler.lap('pipes')
+            active = self.game_objects['active']    # the level changes when mario goes through a pipe
             # print(self.mario.rect.x, self.mario.rect.y)
-            self.game_objects['q_blocks'].update()
-            self.game_objects['items'].update()
-            self.game_objects['coins'].update()
-            for goomba in self.game_objects['goomba']:
+            active.awake['q_blocks'].update()
+            self.game_objects['items'].update()    # items only appear next to mario, so always update them
+            active.awake['coins'].update()
+            self.profiler.lap('items')
+            self.game_objects['enemy_sweep'].update(active.awake['goomba'], active.awake['koopa'])
+            for goomba in active.awake['goomba'].sprites():
                 goomba.update()
-            for koopa in self.game_objects['koopa']:
+            for koopa in active.awake['koopa'].sprites():
                 koopa.update()
+            self.profiler.lap('enemies')
+        if self.game_active:
+            self.check_timer()
+
+    def draw(self, alpha=None):
+        # draws the screen, with moving sprites alpha of the way through the last physics step if given
+        if alpha is not None:
+            self.interpolator.apply(self.map_group, self.map_layer, alpha)
         self.map_group.draw(self.screen)
+        if self.profiler.enabled:
+            asset_cache.check_drawn(self.map_group)     # images drawn in a format other than the display's
+        self.renderer.track_view((self.map_layer, tuple(self.map_layer.view_rect), self.game_active))
+        self.renderer.track_sprites(self.map_group, self.map_layer.view_rect)
+        self.interpolator.restore()
+        self.profiler.lap('draw')
         if not self.game_active:
             self.menu.blit()
         if self.game_active:
-            self.stats.blit()
-            self.check_timer()
-        pygame.display.flip()
+            self.renderer.mark(self.stats.blit())
+        self.profiler.lap('hud')
+        self.renderer.mark(self.profiler.blit())
+        self.renderer.present()
+        self.profiler.lap('flip')
+        self.profiler.end_frame()
 
     def check_timer(self):
         # check the game timer
         if not self.paused:
-            time = pygame.time.get_ticks()
+            time = game_clock.get_ticks()
             if time - self.last_tick > 600 and self.timer > 0:
                 self.last_tick = time
                 self.timer -= 1
@@ -256,7 +363,7 @@ class Game:
         # player has been killed by game
         self.lives -= 1
         if self.lives > 0:
-            self.init_world()
+            self.respawn()
             self.timer = 400
         else:
             self.game_active = False
@@ -269,37 +376,92 @@ class Game:
             loop.check_events()
             self.update()
             if self.menu.start:
-                self.game_active = True
-                self.timer = 400
-                self.time_warn = False
                 self.start_game()
                 self.menu.start = False
                 self.game_active = False
                 self.game_won = False
-                self.init_world()
+                self.respawn()
 
-    def start_game(self):
-        # launches game
-        loop = EventLoop(loop_running=True, actions=self.action_map)
+    def new_game(self):
+        # resets the session for a new game
+        self.game_active = True
+        self.timer = 400
+        self.time_warn = False
         self.score = 0
         self.lives = 3
         self.coins = 0
+        self.mario.score = 0
+        self.mario.restart()
+        self.last_tick = game_clock.get_ticks()     # timestamps from a previous game would skew its timers
+        animation_scheduler.restart()
 
+    def start_game(self):
+        # launches game
+        loop = EventLoop(loop_running=True, actions=self.action_map, events=self.get_events)
+        self.new_game()
+        if not game_clock.is_throttled():
+            while loop.loop_running and self.game_active:
+                self.step(loop)
+            return
+        # physics runs in fixed steps of game time, as many as the time since the last frame calls for,
+        # and frames are drawn as often as the machine manages with sprites between their last two steps
+        step_ms = 1000 / game_clock.fps
+        lag = 0.0
+        self.interpolator.clear()
+        self.clock.tick()
         while loop.loop_running and self.game_active:
-            self.clock.tick(60)     # 60 fps cap
-            loop.check_events()
-            self.update()
-            if self.mario.state_info['death_finish']:
-                self.handle_player_killed()
-            elif not pygame.mixer.music.get_busy() and self.game_won:
-                self.menu.high_score.save(self.score)
-                self.game_active = False
-            elif not pygame.mixer.music.get_busy() and self.mario.state_info['dead']:
-                pygame.mixer.music.load('audio/Mario-Die.wav')
-                pygame.mixer.music.play()
-            elif not pygame.mixer.music.get_busy() and not self.paused:
-                pygame.mixer.music.load('audio/BG-Main.wav')
-                pygame.mixer.music.play(-1)
+            lag = min(lag + self.clock.tick(MAX_FPS), step_ms * MAX_STEPS)
+            self.profiler.start_frame()
+            while lag >= step_ms and loop.loop_running and self.game_active:
+                self.interpolator.save(self.map_group, self.map_layer)
+                self.tick(loop)
+                lag -= step_ms
+            self.draw(lag / step_ms)
+
+    def simulate(self, frames):
+        # runs a game for a fixed number of logical frames, returns frames run
+        loop = EventLoop(loop_running=True, actions=self.action_map, events=self.get_events)
+        self.new_game()
+        frame = 0
+        while frame < frames and loop.loop_running and self.game_active:
+            if game_clock.is_throttled():
+                self.clock.tick(60)
+            self.step(loop)
+            frame += 1
+        return frame
+
+    def step(self, loop):
+        # runs a single frame of the game, one physics step then drawing it
+        self.profiler.start_frame()
+        self.tick(loop)
+        self.draw()
+
+    def tick(self, loop):
+        # runs a single physics step of the game
+        loop.check_events()
+        self.update_world()
+        game_clock.tick()
+        if self.input_script:
+            self.input_script.advance()
+        if self.next_music:
+            self.play_music(self.next_music, -1)
+            self.next_music = None
+        if self.mario.state_info['death_finish']:
+            self.handle_player_killed()
+        elif not pygame.mixer.music.get_busy() and self.game_won:
+            self.menu.high_score.save(self.score)
+            self.game_active = False
+        elif not pygame.mixer.music.get_busy() and self.mario.state_info['dead']:
+            self.play_music('audio/Mario-Die.wav')
+        elif not pygame.mixer.music.get_busy() and not self.paused:
+            self.play_music('audio/BG-Main.wav', -1)
+
+    def play_music(self, path, loops=0):
+        # switches the music, headless games have no one to hear it so they skip loading it
+        if self.headless:
+            return
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.play(loops)
 
 
 if __name__ == '__main__':
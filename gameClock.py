@@ -0,0 +1,44 @@
+from pygame import time
+
+REAL_TIME = 'real-time'         # game time is wall clock time
+FIXED_STEP = 'fixed-step'       # game time moves a fixed step per frame, frames are paced to the frame rate
+FAST_FORWARD = 'fast-forward'   # game time moves a fixed step per frame, frames run as fast as possible
+
+
+class GameClock:
+    # single source of game time in milliseconds, read by everything instead of pygame.time.get_ticks
+    def __init__(self, mode=REAL_TIME, fps=60):
+        self.mode = mode
+        self.fps = fps
+        self.frame = 0
+        self.start = 0
+
+    def set_mode(self, mode, fps=None):
+        # switch clock mode, carrying on from the current time
+        now = self.get_ticks()
+        self.mode = mode
+        if fps:
+            self.fps = fps
+        self.reset(now)
+
+    def reset(self, start=0):
+        # restart the frame count at the given time in milliseconds
+        self.start = start
+        self.frame = 0
+
+    def is_throttled(self):
+        # true if frames should be paced to the frame rate
+        return self.mode != FAST_FORWARD
+
+    def tick(self):
+        # advance game time by one frame
+        self.frame += 1
+
+    def get_ticks(self):
+        # milliseconds of game time
+        if self.mode == REAL_TIME:
+            return time.get_ticks()
+        return self.start + self.frame * 1000 // self.fps
+
+
+game_clock = GameClock()
@@ -3,13 +3,37 @@ import pygame
 WHITE = (255, 255, 255)
 TEXT_SIZE = 36
 SPACER = 54
+GLYPHS = '0123456789-'
+
+
+class GlyphAtlas:
+    # digits of a font rendered once, numbers are put together from them instead of
+    # going through the font every time (the HUD fonts are monospaced so it looks the same)
+    def __init__(self, font, chars=GLYPHS):
+        self.font = font
+        self.glyphs = {char: font.render(char, True, WHITE) for char in chars}
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def render(self, text):
+        # surface with the text on it, characters the atlas doesn't have go through the font
+        if not text or any(char not in self.glyphs for char in text):
+            return self.font.render(text, True, WHITE)
+        glyphs = [self.glyphs[char] for char in text]
+        surface = pygame.Surface((sum(glyph.get_width() for glyph in glyphs), self.height), pygame.SRCALPHA)
+        x = 0
+        for glyph in glyphs:
+            surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)    # copy, alpha included
+            x += glyph.get_width()
+        return surface
 
 
 class GameStats:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.Font('fonts/PressStart2p-Squished.ttf', TEXT_SIZE)
-        self.font2 = pygame.font.Font('fonts/PressStart2p-Regular.ttf', 20)
+        self.font = pygame.font.Font('fonts/PressStart2P-Squished.ttf', TEXT_SIZE)
+        self.font2 = pygame.font.Font('fonts/PressStart2P-Regular.ttf', 20)
+        self.digits = GlyphAtlas(self.font)
+        self.digits2 = GlyphAtlas(self.font2)
 
         self.s_text = "SCORE"
         self.c_text = "COINS"
@@ -44,6 +68,8 @@ class GameStats:
         self.tnRect = None
         self.LNumber = None
         self.lnRect = None
+        self.values = None
+        self.changed = True     # numbers changed since they were last drawn
 
         self.render(self.s_text, self.c_text, self.w_text, self.t_text, self.l_text)
         self.update(self.s_num, self.c_num, self.w_num, self.t_num, self.l_num)
@@ -83,29 +109,40 @@ class GameStats:
         print(str(temp))
 
     def update(self, s_num, c_num, w_num, t_num, l_num):
-        self.SNumber = self.font.render(s_num, True, WHITE)
-        self.snRect = self.SNumber.get_rect()
-        self.snRect.center = self.sRect.center
-        self.snRect.y += SPACER - SPACER / 2
-        self.CNumber = self.font.render(c_num, True, WHITE)
-        self.cnRect = self.CNumber.get_rect()
-        self.cnRect.center = self.cRect.center
-        self.cnRect.y += SPACER - SPACER / 2
-        self.WNumber = self.font2.render(w_num, True, WHITE)
-        self.wnRect = self.WNumber.get_rect()
-        self.wnRect.center = self.wRect.center
-        self.wnRect.y += SPACER - SPACER/2
-        self.TNumber = self.font.render(t_num, True, WHITE)
-        self.TNumber = self.font.render(t_num, True, WHITE)
-        self.tnRect = self.TNumber.get_rect()
-        self.tnRect.center = self.tRect.center
-        self.tnRect.y += SPACER - SPACER / 2
-        self.LNumber = self.font.render(l_num, True, WHITE)
-        self.lnRect = self.LNumber.get_rect()
-        self.lnRect.center = self.lRect.center
-        self.lnRect.y += SPACER - SPACER / 2
+        # re-composes only the numbers that changed
+        values = (s_num, c_num, w_num, t_num, l_num)
+        if values == self.values:
+            return
+        last = self.values or (None,) * len(values)
+        self.values = values
+        self.changed = True
+        if s_num != last[0]:
+            self.SNumber, self.snRect = self.number(self.digits, s_num, self.sRect)
+        if c_num != last[1]:
+            self.CNumber, self.cnRect = self.number(self.digits, c_num, self.cRect)
+        if w_num != last[2]:
+            self.WNumber, self.wnRect = self.number(self.digits2, w_num, self.wRect)
+        if t_num != last[3]:
+            self.TNumber, self.tnRect = self.number(self.digits, t_num, self.tRect)
+        if l_num != last[4]:
+            self.LNumber, self.lnRect = self.number(self.digits, l_num, self.lRect)
+
+    @staticmethod
+    def number(atlas, text, label_rect):
+        # a number and where it goes, centered under its label
+        image = atlas.render(text)
+        rect = image.get_rect()
+        rect.center = label_rect.center
+        rect.y += SPACER - SPACER / 2
+        return image, rect
+
+    def area(self):
+        # the band across the top of the screen the HUD is drawn in
+        band = self.sRect.unionall([self.snRect, self.wnRect, self.cnRect, self.tnRect, self.lnRect])
+        return 0, band.top, self.screen.get_width(), band.height
 
     def blit(self):
+        # draws the HUD, returns the area if any numbers changed since it was last drawn
         self.screen.blit(self.Scores, self.sRect)
         self.screen.blit(self.SNumber, self.snRect)
         self.screen.blit(self.Coins, self.cRect)
@@ -116,3 +153,7 @@ class GameStats:
         self.screen.blit(self.TNumber, self.tnRect)
         self.screen.blit(self.Lives, self.lRect)
         self.screen.blit(self.LNumber, self.lnRect)
+        if self.changed:
+            self.changed = False
+            return self.area()
+        return None
@@ -0,0 +1,132 @@
+from argparse import ArgumentParser
+import time
+
+
+class ScriptedKeys:
+    # stands in for the result of pygame.key.get_pressed() with a set of held keys
+    def __init__(self, held=()):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return 1 if key in self.held else 0
+
+
+class InputScript:
+    # scripted keyboard input, made of (first frame, last frame, keys held) entries
+    # keys can be pygame key constants or key names, names are looked up once pygame is running
+    def __init__(self, entries=None, repeat=False):
+        self.entries = list(entries) if entries else []
+        self.resolved = False
+        self.length = max([last for first, last, keys in self.entries], default=-1) + 1
+        self.repeat = repeat
+        self.frame = 0
+        self.keys = None
+
+    @classmethod
+    def from_string(cls, text, repeat=False):
+        # builds a script from text like "0-600:right;20-40:space,right" using pygame key names
+        entries = []
+        for part in text.split(';'):
+            if not part.strip():
+                continue
+            frames, names = part.split(':')
+            first, _, last = frames.partition('-')
+            keys = [name.strip() for name in names.split(',') if name.strip()]
+            entries.append((int(first), int(last or first), keys))
+        return cls(entries, repeat)
+
+    def reset(self):
+        # start the script from the first frame again
+        self.frame = 0
+        self.keys = None
+
+    def advance(self):
+        # move on to the next frame
+        self.frame += 1
+        self.keys = None
+
+    def resolve_keys(self):
+        # turn key names into pygame key constants
+        from pygame import key
+        self.entries = [(first, last, [key.key_code(k) if isinstance(k, str) else k for k in keys])
+                        for first, last, keys in self.entries]
+        self.resolved = True
+
+    def get_events(self):
+        # scripts only hold key states, so there are never any events
+        return []
+
+    def get_pressed(self):
+        # key states for the current frame
+        if not self.resolved:
+            self.resolve_keys()
+        if self.keys is None:
+            frame = self.frame % self.length if self.repeat and self.length else self.frame
+            held = set()
+            for first, last, keys in self.entries:
+                if first <= frame <= last:
+                    held.update(keys)
+            self.keys = ScriptedKeys(held)
+        return self.keys
+
+
+def run_headless(frames=3600, runs=1, script=None, profile=None, dirty_rects=False):
+    # plays the game with no window or audio output, returns stats on simulation speed
+    # frame timings are written to profile as json or csv, if given
+    from game import Game
+    from gameClock import game_clock
+    game = Game(headless=True, input_script=script, profile=bool(profile), dirty_rects=dirty_rects)
+    results = []
+    for _ in range(runs):
+        if script:
+            script.reset()
+        loads = len(game.level_loader.stalls)
+        start = time.perf_counter()
+        frames_run = game.simulate(frames)
+        elapsed = time.perf_counter() - start
+        results.append({
+            'frames': frames_run,
+            'seconds': elapsed,
+            'fps': frames_run / elapsed if elapsed else 0.0,
+            'score': game.score + game.mario.score,
+            'lives': game.lives,
+            'won': game.game_won,
+            'max_stall_ms': max([stall for name, stall, prefetched in game.level_loader.stalls[loads:]], default=0.0),
+            'max_awake': game.game_objects['active'].max_awake,
+            'asleep': game.game_objects['active'].stats()['asleep'],
+            'pixels_pushed': game.renderer.stats()['mean_fraction']
+        })
+        game.game_active = False
+        game.game_won = False
+        game_clock.reset()  # every run starts from the same game time
+        game.respawn()
+    if profile and profile.endswith('.csv'):
+        game.profiler.dump_csv(profile)
+    elif profile:
+        game.profiler.dump_json(profile)
+    return results
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Run the game with no display for benchmarking and soak testing')
+    parser.add_argument('--frames', type=int, default=3600, help='logical frames to simulate per run')
+    parser.add_argument('--runs', type=int, default=1, help='number of playthroughs')
+    parser.add_argument('--script', default='0-100000:right;0-100000:left shift',
+                        help='held keys by frame, e.g. "0-600:right;20-40:space"')
+    parser.add_argument('--repeat', action='store_true', help='loop the input script')
+    parser.add_argument('--profile', help='write per stage frame timings to a .json or .csv file')
+    parser.add_argument('--dirty-rects', action='store_true', help='only push changed parts of the screen')
+    args = parser.parse_args()
+    input_script = InputScript.from_string(args.script, args.repeat)
+    for run_num, result in enumerate(run_headless(args.frames, args.runs, input_script, args.profile,
+                                                  args.dirty_rects)):
+        if args.dirty_rects:
+            print('run {}: {:.1%} of the screen pushed per frame'.format(run_num, result['pixels_pushed']))
+        print('run {}: {frames} frames in {seconds:.3f}s ({fps:.1f} fps), score {score}, lives {lives}, '
+              'won {won}, level load stall {max_stall_ms:.1f} ms, '
+              'at most {max_awake} actors awake ({asleep} asleep at the end)'.format(run_num, **result))
+    from assetCache import asset_cache
+    print('asset cache: {hits} hits, {misses} misses, {images} images, '
+          '{unconverted} drawn unconverted'.format(**asset_cache.stats()))
+    from mapCache import map_cache
+    print('map cache: {hits} hits, {misses} misses'.format(**map_cache.stats()))
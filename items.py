@@ -1,7 +1,9 @@
 from animate import Animate
+import collision
+from assetCache import asset_cache
+from pygame import Rect
 from pygame.sprite import Sprite, Group, collide_rect
-from pygame import image as pygimg
-from pygame import time, transform
+from gameClock import game_clock
 
 
 class Item(Sprite):
@@ -23,8 +25,8 @@ class Item(Sprite):
         self.rect.left, self.rect.top = x, y
         self.speed = speed
         self.jump_speed = 0
-        self.obstacles = obstacles  # objects that the item may collide with
-        self.floor = floor      # rects for the floor
+        self.obstacles = obstacles  # spatial grid of objects that the item may collide with
+        self.floor = floor      # floor map of rects for the floor
         self.rise_from = rise_from
 
     def rise(self):
@@ -44,46 +46,18 @@ class Item(Sprite):
     def flip_direction(self):
         # make the item go in the opposite direction
         self.speed = -self.speed
-        self.rect.left += self.speed
 
     def bounce_off_obstacles(self):
-        # checks if the item has hit any obstacles
-        for obs in self.obstacles:
-            pts = [obs.rect.bottomleft, obs.rect.midleft,
-                   obs.rect.bottomright, obs.rect.midright]
-            for pt in pts:
-                if self.rect.collidepoint(pt):
-                    self.flip_direction()
-                    return
-        for rect in self.floor:
-            pts = [rect.midleft, rect.midright, rect.bottomleft, rect.bottomright]
-            y_cap = rect.top
-            for pt in pts:
-                if self.rect.collidepoint(pt) or \
-                        ((self.rect.left == rect.right or self.rect.right == rect.left) and self.rect.top > y_cap):
-                    self.flip_direction()
-                    return
+        # moves the item along, turning it around if it walks into the side of anything
+        for contact in collision.move(self.rect, self.speed, 0, self.obstacles, self.floor):
+            if contact.normal[0]:
+                self.flip_direction()
 
     def fall(self):
-        # makes the item fall through gaps in the ground
-        falling = True
-        for rect in self.floor:
-            # check if bottom is at the top of the floor rect and that the x pos is within floor area
-            if self.rect.bottom == rect.top and (rect.left < self.rect.center[0] < rect.right):
-                self.rect.bottom = rect.top
-                falling = False
-                break
-        if falling:
-            for obj in self.obstacles:
-                pts = [obj.rect.topleft, obj.rect.midtop, obj.rect.topright]
-                for pt in pts:
-                    if self.rect.collidepoint(pt):
-                        falling = False
-                        break
-                if not falling:
-                    break
-        if falling:
-            self.rect.bottom += abs(self.speed)
+        # makes the item fall through gaps in the ground once its centre is over them
+        column = Rect(self.rect.centerx, self.rect.top, 1, self.rect.height)
+        collision.move(column, 0, abs(self.speed), self.obstacles, self.floor)
+        self.rect.bottom = column.bottom
 
     def update(self):
         # updates item position
@@ -91,9 +65,10 @@ class Item(Sprite):
             self.image = self.animator.get_image()
         if not self.rise_from:
             if abs(self.jump_speed) > 0:
-                self.rect.top += self.jump_speed
-                self.jump_speed += 1    # simulate gravity reducing speed
-            self.rect.left += self.speed
+                if collision.move(self.rect, 0, self.jump_speed, self.obstacles, self.floor):
+                    self.jump_speed = 0     # hit something, start falling
+                else:
+                    self.jump_speed += 1    # simulate gravity reducing speed
             self.bounce_off_obstacles()
             self.fall()
         else:
@@ -103,7 +78,7 @@ class Item(Sprite):
 class Mushroom(Item):
     # mushroom powerup
     def __init__(self, x, y, obstacles, floor, rise_from=None):
-        image = pygimg.load('images/mushroom.png')
+        image = asset_cache.load_image('images/mushroom.png')
         speed = 2
         super(Mushroom, self).__init__(x, y, image, speed, obstacles, floor,
                                        Item.MUSHROOM, rise_from, animated=False)
@@ -112,7 +87,7 @@ class Mushroom(Item):
 class OneUp(Item):
     # gives mario extra life
     def __init__(self, x, y, obstacles, floor, rise_from=None):
-        image = pygimg.load('images/mushroom-1-up.png')
+        image = asset_cache.load_image('images/mushroom-1-up.png')
         speed = 2
         super(OneUp, self).__init__(x, y, image, speed, obstacles, floor,
                                     Item.ONE_UP, rise_from, animated=False)
@@ -121,8 +96,8 @@ class OneUp(Item):
 class FireFlower(Item):
     # gives mario fire powers
     def __init__(self, x, y, obstacles, floor, rise_from=None):
-        images = [pygimg.load('images/fire-flower-1.png'), pygimg.load('images/fire-flower-2.png'),
-                  pygimg.load('images/fire-flower-3.png'), pygimg.load('images/fire-flower-4.png')]
+        images = ['images/fire-flower-1.png', 'images/fire-flower-2.png',
+                  'images/fire-flower-3.png', 'images/fire-flower-4.png']
         speed = 0
         super(FireFlower, self).__init__(x, y, images, speed, obstacles,
                                          floor, Item.FIRE_FLOWER, rise_from, True)
@@ -131,23 +106,18 @@ class FireFlower(Item):
 class StarMan(Item):
     # star item that gives invincibility for a few seconds
     def __init__(self, x, y, obstacles, floor, rise_from=None):
-        images = [pygimg.load('images/starman-1.png'), pygimg.load('images/starman-2.png'),
-                  pygimg.load('images/starman-3.png'), pygimg.load('images/starman-4.png')]
+        images = ['images/starman-1.png', 'images/starman-2.png',
+                  'images/starman-3.png', 'images/starman-4.png']
         speed = 2
-        self.last_jump = time.get_ticks()
+        self.last_jump = game_clock.get_ticks()
         self.jump_interval = 1000   # jump around every second
         super(StarMan, self).__init__(x, y, images, speed, obstacles, floor, Item.STARMAN, rise_from, True)
 
     def update(self):
-        touch_floor = False
-        for rect in self.floor:
-            if self.rect.bottom >= rect.top:
-                self.rect.bottom = rect.top
-                touch_floor = True
-                break
-        if abs(self.last_jump - time.get_ticks()) > self.jump_interval and touch_floor:
+        touch_floor = collision.ground(self.rect, self.obstacles, self.floor) is not None
+        if abs(self.last_jump - game_clock.get_ticks()) > self.jump_interval and touch_floor:
             self.jump()
-            self.last_jump = time.get_ticks()
+            self.last_jump = game_clock.get_ticks()
         super(StarMan, self).update()
 
 
@@ -167,21 +137,6 @@ class FireBall(Sprite):
         self.active = True
         super(FireBall, self).__init__()
 
-    def check_hit_wall(self):
-        # checks if fireball hits wall
-        for obs in self.obstacles:
-            pts = [obs.rect.midleft, obs.rect.midright, obs.rect.bottomleft, obs.rect.bottomright]
-            for pt in pts:
-                if self.rect.collidepoint(pt):
-                    self.active = False
-                    return
-        for flr_rect in self.floor:
-            pts = [flr_rect.midleft, flr_rect.midright, flr_rect.bottomleft, flr_rect.bottomright]
-            for pt in pts:
-                if self.rect.collidepoint(pt):
-                    self.active = False
-                    return
-
     def check_hit_enemies(self):
         # checks if fireball hits enemy
         for g_enemy in self.goomba:
@@ -195,36 +150,24 @@ class FireBall(Sprite):
                 self.active = False
                 return
 
-    def apply_gravity(self):
-        # gravity to the fireball
-        bounce = False
-        for obs in self.obstacles:
-            pts = [obs.rect.topleft, obs.rect.midtop, obs.rect.topright]
-            for pt in pts:
-                if self.rect.collidepoint(pt):
-                    bounce = True
-                    break
-            if bounce:
-                break
-        if not bounce:
-            for flr_rect in self.floor:
-                # check if bottom is at the top of the floor rect and that the x pos is within floor area
-                if self.rect.bottom >= flr_rect.top and (flr_rect.left < self.rect.center[0] < flr_rect.right):
-                    bounce = True
-                    break
-        if bounce:
+    def move(self):
+        # moves the fireball, bouncing it off the tops of things and exploding it on anything else
+        landed = False
+        for contact in collision.move(self.rect, self.speed_x, self.speed_y, self.obstacles, self.floor):
+            if contact.normal == (0, -1):
+                landed = True
+            else:
+                self.active = False
+        if landed:
             self.speed_y = -abs(self.speed_y)   # ensure speed in y-direction is negative
         else:
             self.speed_y += 2   # apply gravity
-        self.rect.y += self.speed_y
 
     def update(self):
         # updates position of fireball
         if self.active:
-            self.rect.x += self.speed_x
-            self.apply_gravity()
+            self.move()
             self.image = self.norm_animator.get_image()
-            self.check_hit_wall()
             self.check_hit_enemies()
         elif self.explode_animator.is_animation_done():
             self.kill()
@@ -242,13 +185,19 @@ class FireBallController:
         self.floor = floor
         self.goomba, self.koopa = goomba, koopa
         self.fireballs = Group()
-        self.fb_images = [pygimg.load('images/super_mario_fireball_1.png'), pygimg.load('images/super_mario_fireball_2.png'),
-                          pygimg.load('images/super_mario_fireball_3.png'), pygimg.load('images/super_mario_fireball_4.png')]
-        self.exp_images = [pygimg.load('images/super_mario_fireball_explode_1.png'),
-                           pygimg.load('images/super_mario_fireball_explode_2.png'),
-                           pygimg.load('images/super_mario_fireball_explode_3.png')]
-        self.fb_images = [transform.scale(img, (16, 16)) for img in self.fb_images]
-        self.exp_images = [transform.scale(img, (16, 16)) for img in self.exp_images]
+        self.fb_images = asset_cache.load_images(['images/super_mario_fireball_1.png',
+                                                  'images/super_mario_fireball_2.png',
+                                                  'images/super_mario_fireball_3.png',
+                                                  'images/super_mario_fireball_4.png'], scale=(16, 16))
+        self.exp_images = asset_cache.load_images(['images/super_mario_fireball_explode_1.png',
+                                                   'images/super_mario_fireball_explode_2.png',
+                                                   'images/super_mario_fireball_explode_3.png'], scale=(16, 16))
+
+    def set_level(self, obstacles, floor, goomba, koopa):
+        # throw fireballs against another level's solids and awake enemies
+        self.obstacles = obstacles
+        self.floor = floor
+        self.goomba, self.koopa = goomba, koopa
 
     def throw_fireball(self):
         # throws fireball if there are less than 2
@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+from maps import load_world_map
+from time import perf_counter
+
+
+class LevelLoader:
+    # loads level maps, preparing the ones pipes lead to in a background thread ahead of time
+    def __init__(self, screen):
+        self.screen = screen
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = {}   # map name -> future for the loaded map
+        self.stalls = []    # (map name, milliseconds the game waited, whether it was prefetched)
+
+    @staticmethod
+    def map_file(map_name):
+        return 'images/' + map_name + '.tmx'
+
+    def prefetch(self, map_name):
+        # start loading a map in the background if it isn't already
+        if map_name not in self.pending:
+            self.pending[map_name] = self.executor.submit(load_world_map, self.map_file(map_name), self.screen)
+
+    def load(self, map_name):
+        # the map data, renderer and sprite group for a level, waiting on a prefetch if there is one
+        start = perf_counter()
+        future = self.pending.pop(map_name, None)
+        if future:
+            level = future.result()
+        else:
+            level = load_world_map(self.map_file(map_name), self.screen)
+        self.stalls.append((map_name, (perf_counter() - start) * 1000, future is not None))
+        return level
+
+    def stats(self):
+        # how long level loads held up the game
+        waits = [stall for name, stall, prefetched in self.stalls]
+        return {
+            'loads': len(self.stalls),
+            'prefetched': sum(1 for name, stall, prefetched in self.stalls if prefetched),
+            'last_stall_ms': waits[-1] if waits else 0.0,
+            'max_stall_ms': max(waits, default=0.0)
+        }
@@ -0,0 +1,99 @@
+from animate import Animate
+from pygame import Rect
+from pygame.sprite import AbstractGroup, Group, Sprite
+
+
+def find_group_key():
+    # name of the attribute a sprite keeps its groups in, which is private to pygame (_Sprite__g in 2.x),
+    # so it is looked up on a test sprite instead of trusted, and a snapshot can't be taken without it
+    sprite = Sprite()
+    group = Group(sprite)
+    for name, value in vars(sprite).items():
+        if isinstance(value, (set, dict)) and group in value:
+            return name
+    raise RuntimeError('pygame sprites no longer keep their groups in an attribute, '
+                       'LevelSnapshot would copy group membership back over live sprites')
+
+
+GROUP_KEY = find_group_key()    # the groups a sprite is in, restored through the groups themselves
+
+
+def refill_dict(value, contents):
+    value.clear()
+    value.update(contents)
+
+
+def refill_list(value, contents):
+    value[:] = contents
+
+
+def save_contents(value):
+    # how to put back the contents of a value that can change in place, or None if it can't
+    if isinstance(value, Rect):
+        return Rect.update, value, value.copy()
+    if isinstance(value, dict):
+        return refill_dict, value, dict(value)
+    if isinstance(value, list):
+        return refill_list, value, list(value)
+    if isinstance(value, Animate):
+        return restore_state, value, save_state(value)
+    return None
+
+
+def save_state(obj):
+    # copy of an object's attributes, and of the contents of the ones that can change in place
+    attributes = {name: value for name, value in vars(obj).items() if name != GROUP_KEY}
+    contents = [saved for saved in map(save_contents, attributes.values()) if saved]
+    return attributes, contents
+
+
+def restore_state(obj, state):
+    # reset an object's attributes to a saved copy, dropping any added since
+    attributes, contents = state
+    current = vars(obj)
+    if len(current) - (GROUP_KEY in current) != len(attributes):
+        for name in [name for name in current if name not in attributes and name != GROUP_KEY]:
+            del current[name]
+    current.update(attributes)
+    for refill, value, saved in contents:
+        refill(value, saved)
+
+
+class LevelSnapshot:
+    # the starting state of a level's sprites, groups and collision grid, restored in place
+    # so respawning doesn't have to reload the map and rebuild every sprite
+    def __init__(self, game):
+        self.tmx_data = game.tmx_data
+        self.map_layer = game.map_layer
+        self.map_group = game.map_group
+        self.player_spawn = game.player_spawn
+        self.game_objects = game.game_objects
+        self.groups = {name: group.sprites() for name, group in self.game_objects.items()
+                       if isinstance(group, AbstractGroup)}
+        self.drawn = [(sprite, self.map_group.get_layer_of_sprite(sprite)) for sprite in self.map_group.sprites()
+                      if sprite is not game.mario]
+        grid = self.game_objects['collide_grid']
+        self.grid_order = [entry[1] for entry in sorted(grid.entries.values(), key=lambda entry: entry[0])]
+        sprites = {id(sprite): sprite for sprite, layer in self.drawn}
+        for members in self.groups.values():
+            sprites.update((id(sprite), sprite) for sprite in members if sprite is not game.mario)
+        self.states = [(sprite, save_state(sprite)) for sprite in sprites.values()]
+
+    def restore(self, game):
+        # put the level back the way it was captured and make it the game's current level
+        for sprite, state in self.states:
+            restore_state(sprite, state)
+        for name, members in self.groups.items():
+            group = self.game_objects[name]
+            group.empty()
+            group.add(*members)
+        self.map_group.empty()
+        for sprite, layer in self.drawn:
+            self.map_group.add(sprite, layer=layer)
+        grid = self.game_objects['collide_grid']
+        grid.clear()
+        for obj in self.grid_order:
+            grid.add(obj)
+        game.tmx_data, game.map_layer, game.map_group = self.tmx_data, self.map_layer, self.map_group
+        game.player_spawn = self.player_spawn
+        game.game_objects = self.game_objects
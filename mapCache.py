@@ -0,0 +1,120 @@
+from hashlib import sha1
+from pytmx import TiledMap, TiledElement
+from pytmx.util_pygame import pygame_image_loader
+import io
+import os
+import pickle
+import re
+import struct
+
+CACHE_DIR = 'cache/maps'
+MAGIC = b'MMAP'
+VERSION = 1
+HEADER = struct.Struct('<4sB20sH')     # magic, format version, source hash, length of the source list
+TILESET_SOURCE = re.compile(rb'<tileset[^>]*\ssource="([^"]+)"')
+
+
+def new_element(cls):
+    return cls.__new__(cls)
+
+
+def set_element_state(element, state):
+    # fill in a tmx element without going through its __getattr__, which loops until properties is set
+    element.__dict__.update(state)
+
+
+class MapPickler(pickle.Pickler):
+    # pickles tmx elements by their attributes (and items, for object groups) alone
+    def reducer_override(self, obj):
+        if isinstance(obj, TiledElement):
+            items = iter(obj) if isinstance(obj, list) else None
+            return new_element, (type(obj),), obj.__dict__, items, None, set_element_state
+        return NotImplemented
+
+
+class MapCache:
+    # keeps parsed tmx maps in binary snapshots so later loads skip the xml parsing, a
+    # snapshot is only used while the hash of the tmx and tileset files it came from matches
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def cache_file(self, map_file):
+        return os.path.join(self.cache_dir, os.path.basename(map_file) + '.bin')
+
+    @staticmethod
+    def source_hash(sources):
+        # hash of the contents of every file the map was parsed from
+        digest = sha1()
+        for source in sources:
+            with open(source, 'rb') as file:
+                digest.update(file.read())
+        return digest.digest()
+
+    @staticmethod
+    def sources(map_file):
+        # the tmx file and the external tileset files it uses
+        with open(map_file, 'rb') as file:
+            names = TILESET_SOURCE.findall(file.read())
+        folder = os.path.dirname(map_file)
+        return [map_file] + [os.path.join(folder, name.decode('utf-8')) for name in names]
+
+    def read(self, map_file):
+        # the parsed map from a snapshot, or None if there isn't an up to date one
+        try:
+            with open(self.cache_file(map_file), 'rb') as file:
+                data = file.read()
+        except OSError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        magic, version, digest, length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            return None
+        start = HEADER.size + length
+        sources = data[HEADER.size:start].decode('utf-8').split('\n')
+        try:
+            if sources[0] != map_file or self.source_hash(sources) != digest:
+                return None
+        except OSError:
+            return None
+        return pickle.loads(memoryview(data)[start:])
+
+    def write(self, map_file, tmx_data):
+        # snapshot a parsed map, the rename keeps a half written file from ever being read
+        sources = self.sources(map_file)
+        names = '\n'.join(sources).encode('utf-8')
+        body = io.BytesIO()
+        MapPickler(body, pickle.HIGHEST_PROTOCOL).dump(tmx_data)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.cache_file(map_file)
+        temp = '{}.{}.tmp'.format(path, os.getpid())
+        with open(temp, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.source_hash(sources), len(names)))
+            file.write(names)
+            file.write(body.getvalue())
+        os.replace(temp, path)
+
+    def load(self, map_file):
+        # same as pytmx's load_pygame, parsing the tmx only when its snapshot is missing or stale
+        tmx_data = self.read(map_file)
+        if tmx_data is None:
+            self.misses += 1
+            tmx_data = TiledMap(map_file)
+            try:
+                self.write(map_file, tmx_data)
+            except OSError:
+                pass    # a read only checkout just parses every time
+        else:
+            self.hits += 1
+        tmx_data.image_loader = pygame_image_loader
+        tmx_data.reload_images()
+        return tmx_data
+
+    def stats(self):
+        # hit/miss counters for the cache
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+map_cache = MapCache()
@@ -1,10 +1,11 @@
-from pytmx.util_pygame import load_pygame
+from mapCache import map_cache
+from staticLayer import StaticLayerData
 import pyscroll
 
 
 def load_world_map(map_file, screen):
-    tmx_data = load_pygame(map_file)
-    map_data = pyscroll.data.TiledMapData(tmx_data)
+    tmx_data = map_cache.load(map_file)
+    map_data = StaticLayerData(tmx_data)     # decorations and the flag baked into the tile layers
     w, h = screen.get_size()
     map_renderer = pyscroll.BufferedRenderer(map_data, (int(w * 0.65), int(h * 0.65)))  # map renderer
     map_group = pyscroll.PyscrollGroup(map_layer=map_renderer, default_layer=5)  # Sprite group for map
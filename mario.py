@@ -1,17 +1,113 @@
 from items import Item, FireBallController
 import pygame as pg
 import constants as c
+import collision
+from gameClock import game_clock
+from assetCache import asset_cache, CONVERT, CONVERT_ALPHA
+from soundBank import sound_bank
+from spriteAtlas import atlas_cache
+
+
+SHEET_FRAMES = {    # frame lists cut out of mario_bros.png, as (x, y, width, height) on the sheet
+    # Images for normal small mario
+    'right_small_normal_frames': [
+        (178, 32, 12, 16),      # Right [0]
+        (80, 32, 15, 16),       # Right walking 1 [1]
+        (96, 32, 16, 16),       # Right walking 2 [2]
+        (112, 32, 16, 16),      # Right walking 3 [3]
+        (144, 32, 16, 16),      # Right jump [4]
+        (130, 32, 14, 16),      # Right skid [5]
+        (160, 32, 15, 16),      # Death frame [6]
+        (320, 8, 16, 24),       # Transition small to big [7]
+        (241, 33, 16, 16),      # Transition big to small [8]
+        (194, 32, 12, 16),      # Frame 1 of flag pole Slide [9]
+        (210, 33, 12, 16)       # Frame 2 of flag pole slide [10]
+    ],
+    # Images for small mario (for invincible animation)
+    'right_small_red_frames': [
+        (178, 272, 12, 16),     # Right standing [0]
+        (80, 272, 15, 16),      # Right walking 1 [1]
+        (96, 272, 16, 16),      # Right walking 2 [2]
+        (112, 272, 15, 16),     # Right walking 3 [3]
+        (144, 272, 16, 16),     # Right jump [4]
+        (130, 272, 14, 16)      # Right skid [5]
+    ],
+    # Images for small black mario (for invincible animation)
+    'right_small_black_frames': [
+        (178, 176, 12, 16),     # Right standing [0]
+        (80, 176, 15, 16),      # Right walking 1 [1]
+        (96, 176, 16, 16),      # Right walking 2 [2]
+        (112, 176, 15, 16),     # Right walking 3 [3]
+        (144, 176, 16, 16),     # Right jump [4]
+        (130, 176, 14, 16)      # Right skid [5]
+    ],
+    # Images for normal big Mario
+    'right_big_normal_frames': [
+        (176, 0, 16, 32),       # Right standing [0]
+        (81, 0, 16, 32),        # Right walking 1 [1]
+        (97, 0, 15, 32),        # Right walking 2 [2]
+        (113, 0, 15, 32),       # Right walking 3 [3]
+        (144, 0, 16, 32),       # Right jump [4]
+        (128, 0, 16, 32),       # Right skid [5]
+        (336, 0, 16, 32),       # Right throwing [6]
+        (160, 10, 16, 22),      # Right crouching [7]
+        (272, 2, 16, 29),       # Transition big to small [8]
+        (193, 2, 16, 30),       # Frame 1 of flag pole slide [9]
+        (209, 2, 16, 29)        # Frame 2 of flag pole slide [10]
+    ],
+    # Images for red big Mario
+    'right_big_red_frames': [
+        (176, 240, 16, 32),     # Right standing [0]
+        (81, 240, 16, 32),      # Right walking 1 [1]
+        (97, 240, 15, 32),      # Right walking 2 [2]
+        (113, 240, 15, 32),     # Right walking 3 [3]
+        (144, 240, 16, 32),     # Right jump [4]
+        (128, 240, 16, 32),     # Right skid [5]
+        (336, 240, 16, 32),     # Right throwing [6]
+        (160, 250, 16, 22)      # Right crouching [7]
+    ],
+    # Images for black big Mario
+    'right_big_black_frames': [
+        (176, 144, 16, 32),     # Right standing [0]
+        (81, 144, 16, 32),      # Right walking 1 [1]
+        (97, 144, 15, 32),      # Right walking 2 [2]
+        (113, 144, 15, 32),     # Right walking 3 [3]
+        (144, 144, 16, 32),     # Right jump [4]
+        (128, 144, 16, 32),     # Right skid [5]
+        (336, 144, 16, 32),     # Right throwing [6]
+        (160, 154, 16, 22)      # Right Crouching [7]
+    ],
+    # Images for Fire Mario
+    'right_fire_frames': [
+        (176, 48, 16, 32),      # Right standing [0]
+        (81, 48, 16, 32),       # Right walking 1 [1]
+        (97, 48, 15, 32),       # Right walking 2 [2]
+        (113, 48, 15, 32),      # Right walking 3 [3]
+        (144, 48, 16, 32),      # Right jump [4]
+        (128, 48, 16, 32),      # Right skid [5]
+        (336, 48, 16, 32),      # Right throwing [6]
+        (160, 58, 16, 22),      # Right crouching [7]
+        (0, 0, 0, 0),           # Place holder [8]
+        (193, 50, 16, 29),      # Frame 1 of flag pole slide [9]
+        (209, 50, 16, 29)       # Frame 2 of flag pole slide [10]
+    ]
+}
+# the left image frames are numbered the same as the right frames but are simply reversed
+MIRRORED_FRAMES = {
+    'left_small_normal_frames': 'right_small_normal_frames',
+    'left_small_red_frames': 'right_small_red_frames',
+    'left_small_black_frames': 'right_small_black_frames',
+    'left_big_normal_frames': 'right_big_normal_frames',
+    'left_big_red_frames': 'right_big_red_frames',
+    'left_big_black_frames': 'right_big_black_frames',
+    'left_fire_frames': 'right_fire_frames'
+}
 
 
 class Mario(pg.sprite.Sprite):
     def __init__(self, game_objects, map_layer, map_group, screen):
         pg.sprite.Sprite.__init__(self)
-        self.sprite_sheet = pg.image.load('images/mario_bros.png')
-        if self.sprite_sheet.get_alpha():
-            self.sprite_sheet = self.sprite_sheet.convert_alpha()
-        else:
-            self.sprite_sheet = self.sprite_sheet.convert()
-            self.sprite_sheet.set_colorkey((255, 0, 255))
+        self.sprite_sheet = None    # only loaded if the frame atlas has to be baked
         self.SFX = None
         self.load_sounds()
         self.game_objects = game_objects
@@ -19,9 +115,10 @@ class Mario(pg.sprite.Sprite):
         self.screen = screen
         self.screen_rect = self.screen.get_rect()
         # fireball controller allows the throwing of fireballs when possible
+        awake = game_objects['active'].awake    # fireballs only hit enemies that are awake
         self.fireball_controller = FireBallController(screen, map_group,
-                                                      game_objects['collide_objs'], game_objects['floors'], self,
-                                                      goomba=game_objects['goomba'], koopa=game_objects['koopa'])
+                                                      game_objects['collide_grid'], game_objects['floor_map'], self,
+                                                      goomba=awake['goomba'], koopa=awake['koopa'])
         self.screen_shift = 0
         self.left_bound = 0
         self.timers = {}
@@ -56,7 +153,7 @@ class Mario(pg.sprite.Sprite):
         self.black_big_frames = None
         self.fire_frames = None
         self.invincible_big_frames_list = None
-        self.all_images = None
+        self.blank_frames = None
         self.right_frames = None
         self.left_frames = None
 
@@ -124,6 +221,7 @@ class Mario(pg.sprite.Sprite):
         self.state_info['in_castle'] = False
         self.state_info['crouching'] = False
         self.state_info['losing_invincibility'] = False
+        self.state_info['blink_hidden'] = False
 
     def setup_forces(self):
         # mario physics/velocity
@@ -146,212 +244,37 @@ class Mario(pg.sprite.Sprite):
     def load_sounds(self):
         # mario sound effects
         self.SFX = {
-            'big_jump': pg.mixer.Sound('audio/Big-Mario-Jump.wav'),
-            'coin': pg.mixer.Sound('audio/Coin.wav'),
-            'small_jump': pg.mixer.Sound('audio/Small-Mario-Jump.wav'),
-            'fireball': pg.mixer.Sound('audio/Fireball.wav'),
-            'kick': pg.mixer.Sound('audio/Mario-Kick-Shell.wav'),
-            'stomp': pg.mixer.Sound('audio/Mario-Stomp.wav'),
-            'powerup': pg.mixer.Sound('audio/Get-Powerup.wav'),
-            'shrink': pg.mixer.Sound('audio/Mario-Shrink.wav')
+            'big_jump': sound_bank.load('audio/Big-Mario-Jump.wav'),
+            'coin': sound_bank.load('audio/Coin.wav'),
+            'small_jump': sound_bank.load('audio/Small-Mario-Jump.wav'),
+            'fireball': sound_bank.load('audio/Fireball.wav'),
+            'kick': sound_bank.load('audio/Mario-Kick-Shell.wav'),
+            'stomp': sound_bank.load('audio/Mario-Stomp.wav'),
+            'powerup': sound_bank.load('audio/Get-Powerup.wav'),
+            'shrink': sound_bank.load('audio/Mario-Shrink.wav')
         }
 
     def load_images_from_sheet(self):
-        # mario images get loaded
-
-        self.right_frames = []
-        self.left_frames = []
-
-        self.right_small_normal_frames = []
-        self.left_small_normal_frames = []
-        self.right_small_red_frames = []
-        self.left_small_red_frames = []
-        self.right_small_black_frames = []
-        self.left_small_black_frames = []
-
-        self.right_big_normal_frames = []
-        self.left_big_normal_frames = []
-        self.right_big_red_frames = []
-        self.left_big_red_frames = []
-        self.right_big_black_frames = []
-        self.left_big_black_frames = []
-
-        self.right_fire_frames = []
-        self.left_fire_frames = []
-
-        # Images for normal small mario#
-
-        self.right_small_normal_frames.append(
-            self.get_image(178, 32, 12, 16))  # Right [0]
-        self.right_small_normal_frames.append(
-            self.get_image(80, 32, 15, 16))  # Right walking 1 [1]
-        self.right_small_normal_frames.append(
-            self.get_image(96, 32, 16, 16))  # Right walking 2 [2]
-        self.right_small_normal_frames.append(
-            self.get_image(112, 32, 16, 16))  # Right walking 3 [3]
-        self.right_small_normal_frames.append(
-            self.get_image(144, 32, 16, 16))  # Right jump [4]
-        self.right_small_normal_frames.append(
-            self.get_image(130, 32, 14, 16))  # Right skid [5]
-        self.right_small_normal_frames.append(
-            self.get_image(160, 32, 15, 16))  # Death frame [6]
-        self.right_small_normal_frames.append(
-            self.get_image(320, 8, 16, 24))  # Transition small to big [7]
-        self.right_small_normal_frames.append(
-            self.get_image(241, 33, 16, 16))  # Transition big to small [8]
-        self.right_small_normal_frames.append(
-            self.get_image(194, 32, 12, 16))  # Frame 1 of flag pole Slide [9]
-        self.right_small_normal_frames.append(
-            self.get_image(210, 33, 12, 16))  # Frame 2 of flag pole slide [10]
-
-        # Images for small mario (for invincible animation)#
-
-        self.right_small_red_frames.append(
-            self.get_image(178, 272, 12, 16))  # Right standing [0]
-        self.right_small_red_frames.append(
-            self.get_image(80, 272, 15, 16))  # Right walking 1 [1]
-        self.right_small_red_frames.append(
-            self.get_image(96, 272, 16, 16))  # Right walking 2 [2]
-        self.right_small_red_frames.append(
-            self.get_image(112, 272, 15, 16))  # Right walking 3 [3]
-        self.right_small_red_frames.append(
-            self.get_image(144, 272, 16, 16))  # Right jump [4]
-        self.right_small_red_frames.append(
-            self.get_image(130, 272, 14, 16))  # Right skid [5]
-
-        # Images for small black mario (for invincible animation)#
-
-        self.right_small_black_frames.append(
-            self.get_image(178, 176, 12, 16))  # Right standing [0]
-        self.right_small_black_frames.append(
-            self.get_image(80, 176, 15, 16))  # Right walking 1 [1]
-        self.right_small_black_frames.append(
-            self.get_image(96, 176, 16, 16))  # Right walking 2 [2]
-        self.right_small_black_frames.append(
-            self.get_image(112, 176, 15, 16))  # Right walking 3 [3]
-        self.right_small_black_frames.append(
-            self.get_image(144, 176, 16, 16))  # Right jump [4]
-        self.right_small_black_frames.append(
-            self.get_image(130, 176, 14, 16))  # Right skid [5]
-
-        # Images for normal big Mario
-
-        self.right_big_normal_frames.append(
-            self.get_image(176, 0, 16, 32))  # Right standing [0]
-        self.right_big_normal_frames.append(
-            self.get_image(81, 0, 16, 32))  # Right walking 1 [1]
-        self.right_big_normal_frames.append(
-            self.get_image(97, 0, 15, 32))  # Right walking 2 [2]
-        self.right_big_normal_frames.append(
-            self.get_image(113, 0, 15, 32))  # Right walking 3 [3]
-        self.right_big_normal_frames.append(
-            self.get_image(144, 0, 16, 32))  # Right jump [4]
-        self.right_big_normal_frames.append(
-            self.get_image(128, 0, 16, 32))  # Right skid [5]
-        self.right_big_normal_frames.append(
-            self.get_image(336, 0, 16, 32))  # Right throwing [6]
-        self.right_big_normal_frames.append(
-            self.get_image(160, 10, 16, 22))  # Right crouching [7]
-        self.right_big_normal_frames.append(
-            self.get_image(272, 2, 16, 29))  # Transition big to small [8]
-        self.right_big_normal_frames.append(
-            self.get_image(193, 2, 16, 30))  # Frame 1 of flag pole slide [9]
-        self.right_big_normal_frames.append(
-            self.get_image(209, 2, 16, 29))  # Frame 2 of flag pole slide [10]
-
-        # Images for red big Mario#
-
-        self.right_big_red_frames.append(
-            self.get_image(176, 240, 16, 32))  # Right standing [0]
-        self.right_big_red_frames.append(
-            self.get_image(81, 240, 16, 32))  # Right walking 1 [1]
-        self.right_big_red_frames.append(
-            self.get_image(97, 240, 15, 32))  # Right walking 2 [2]
-        self.right_big_red_frames.append(
-            self.get_image(113, 240, 15, 32))  # Right walking 3 [3]
-        self.right_big_red_frames.append(
-            self.get_image(144, 240, 16, 32))  # Right jump [4]
-        self.right_big_red_frames.append(
-            self.get_image(128, 240, 16, 32))  # Right skid [5]
-        self.right_big_red_frames.append(
-            self.get_image(336, 240, 16, 32))  # Right throwing [6]
-        self.right_big_red_frames.append(
-            self.get_image(160, 250, 16, 22))  # Right crouching [7]
-
-        # Images for black big Mario#
-
-        self.right_big_black_frames.append(
-            self.get_image(176, 144, 16, 32))  # Right standing [0]
-        self.right_big_black_frames.append(
-            self.get_image(81, 144, 16, 32))  # Right walking 1 [1]
-        self.right_big_black_frames.append(
-            self.get_image(97, 144, 15, 32))  # Right walking 2 [2]
-        self.right_big_black_frames.append(
-            self.get_image(113, 144, 15, 32))  # Right walking 3 [3]
-        self.right_big_black_frames.append(
-            self.get_image(144, 144, 16, 32))  # Right jump [4]
-        self.right_big_black_frames.append(
-            self.get_image(128, 144, 16, 32))  # Right skid [5]
-        self.right_big_black_frames.append(
-            self.get_image(336, 144, 16, 32))  # Right throwing [6]
-        self.right_big_black_frames.append(
-            self.get_image(160, 154, 16, 22))  # Right Crouching [7]
-
-        # Images for Fire Mario#
-
-        self.right_fire_frames.append(
-            self.get_image(176, 48, 16, 32))  # Right standing [0]
-        self.right_fire_frames.append(
-            self.get_image(81, 48, 16, 32))  # Right walking 1 [1]
-        self.right_fire_frames.append(
-            self.get_image(97, 48, 15, 32))  # Right walking 2 [2]
-        self.right_fire_frames.append(
-            self.get_image(113, 48, 15, 32))  # Right walking 3 [3]
-        self.right_fire_frames.append(
-            self.get_image(144, 48, 16, 32))  # Right jump [4]
-        self.right_fire_frames.append(
-            self.get_image(128, 48, 16, 32))  # Right skid [5]
-        self.right_fire_frames.append(
-            self.get_image(336, 48, 16, 32))  # Right throwing [6]
-        self.right_fire_frames.append(
-            self.get_image(160, 58, 16, 22))  # Right crouching [7]
-        self.right_fire_frames.append(
-            self.get_image(0, 0, 0, 0))  # Place holder [8]
-        self.right_fire_frames.append(
-            self.get_image(193, 50, 16, 29))  # Frame 1 of flag pole slide [9]
-        self.right_fire_frames.append(
-            self.get_image(209, 50, 16, 29))  # Frame 2 of flag pole slide [10]
-
-        # The left image frames are numbered the same as the right
-        # frames but are simply reversed.
-
-        for frame in self.right_small_normal_frames:
-            new_image = pg.transform.flip(frame, True, False)
-            self.left_small_normal_frames.append(new_image)
-
-        for frame in self.right_small_red_frames:
-            new_image = pg.transform.flip(frame, True, False)
-            self.left_small_red_frames.append(new_image)
-
-        for frame in self.right_small_black_frames:
-            new_image = pg.transform.flip(frame, True, False)
-            self.left_small_black_frames.append(new_image)
-
-        for frame in self.right_big_normal_frames:
-            new_image = pg.transform.flip(frame, True, False)
-            self.left_big_normal_frames.append(new_image)
-
-        for frame in self.right_big_red_frames:
-            new_image = pg.transform.flip(frame, True, False)
-            self.left_big_red_frames.append(new_image)
-
-        for frame in self.right_big_black_frames:
-            new_image = pg.transform.flip(frame, True, False)
-            self.left_big_black_frames.append(new_image)
-
-        for frame in self.right_fire_frames:
-            new_image = pg.transform.flip(frame, True, False)
-            self.left_fire_frames.append(new_image)
+        # mario images come from an atlas baked once from the sprite sheet
+        atlas = atlas_cache.load('mario', 'images/mario_bros.png', SHEET_FRAMES, self.get_image,
+                                 mirrors=MIRRORED_FRAMES, colorkey=c.BLACK, scale=c.SIZE_MULTIPLIER)
+
+        self.right_small_normal_frames = atlas.frames('right_small_normal_frames')
+        self.left_small_normal_frames = atlas.frames('left_small_normal_frames')
+        self.right_small_red_frames = atlas.frames('right_small_red_frames')
+        self.left_small_red_frames = atlas.frames('left_small_red_frames')
+        self.right_small_black_frames = atlas.frames('right_small_black_frames')
+        self.left_small_black_frames = atlas.frames('left_small_black_frames')
+
+        self.right_big_normal_frames = atlas.frames('right_big_normal_frames')
+        self.left_big_normal_frames = atlas.frames('left_big_normal_frames')
+        self.right_big_red_frames = atlas.frames('right_big_red_frames')
+        self.left_big_red_frames = atlas.frames('left_big_red_frames')
+        self.right_big_black_frames = atlas.frames('right_big_black_frames')
+        self.left_big_black_frames = atlas.frames('left_big_black_frames')
+
+        self.right_fire_frames = atlas.frames('right_fire_frames')
+        self.left_fire_frames = atlas.frames('left_fire_frames')
 
         self.normal_small_frames = [self.right_small_normal_frames,
                                     self.left_small_normal_frames]
@@ -382,24 +305,25 @@ class Mario(pg.sprite.Sprite):
                                            self.red_big_frames,
                                            self.black_big_frames]
 
-        self.all_images = [self.right_big_normal_frames,
-                           self.right_big_black_frames,
-                           self.right_big_red_frames,
-                           self.right_small_normal_frames,
-                           self.right_small_red_frames,
-                           self.right_small_black_frames,
-                           self.left_big_normal_frames,
-                           self.left_big_black_frames,
-                           self.left_big_red_frames,
-                           self.left_small_normal_frames,
-                           self.left_small_red_frames,
-                           self.left_small_black_frames]
+        # invisible frames shown instead of the current one while blinking after getting hurt
+        self.blank_frames = atlas.blanks()
 
         self.right_frames = self.normal_small_frames[0]
         self.left_frames = self.normal_small_frames[1]
 
+    def load_sheet(self):
+        # sprite sheet the frames are cut from
+        self.sprite_sheet = asset_cache.load_image('images/mario_bros.png', convert=None)
+        if self.sprite_sheet.get_alpha():
+            self.sprite_sheet = asset_cache.load_image('images/mario_bros.png', convert=CONVERT_ALPHA)
+        else:
+            self.sprite_sheet = asset_cache.load_image('images/mario_bros.png', convert=CONVERT)
+            self.sprite_sheet.set_colorkey((255, 0, 255))
+
     def get_image(self, x, y, width, height):
         # extracts loaded images
+        if self.sprite_sheet is None:
+            self.load_sheet()
         image = pg.Surface([width, height])
         rect = image.get_rect()
 
@@ -410,6 +334,19 @@ class Mario(pg.sprite.Sprite):
                                     int(rect.height * c.SIZE_MULTIPLIER)))
         return image
 
+    def restart(self):
+        # back to how mario starts a game, small and still with fresh timers, where he stands now
+        self.setup_timers()
+        self.setup_state_booleans()
+        self.setup_forces()
+        self.setup_counters()
+        self.right_frames = self.normal_small_frames[0]
+        self.left_frames = self.normal_small_frames[1]
+        self.state = c.WALK
+        self.image = self.right_frames[self.frame_index]
+        self.rect = self.image.get_rect(topleft=self.rect.topleft)
+        self.mask = pg.mask.from_surface(self.image)
+
     def reset(self, map_layer, game_objects, reset_booleans=True):
         # resets all states
         if reset_booleans:
@@ -417,6 +354,9 @@ class Mario(pg.sprite.Sprite):
         self.state = c.WALK
         self.map_layer = map_layer
         self.game_objects = game_objects
+        awake = game_objects['active'].awake
+        self.fireball_controller.set_level(game_objects['collide_grid'], game_objects['floor_map'],
+                                           awake['goomba'], awake['koopa'])
         self.left_bound = 0
         self.screen_shift = 0
 
@@ -439,30 +379,24 @@ class Mario(pg.sprite.Sprite):
 
     def check_fall(self):
         # check if mario fell through hole
-        falling = True
-
-        for flr_rect in self.game_objects['floors']:
-            if self.rect.bottom >= flr_rect.top and (flr_rect.left < self.rect.left < flr_rect.right) and \
-                    not self.rect.top >= flr_rect.bottom:
-                self.rect.bottom = flr_rect.top
-                self.y_vel = 0
-                falling = False
-                break
-        if falling:
-            for obj in self.game_objects['collide_objs']:
-                if self.rect.bottom >= obj.rect.top and (obj.rect.left < self.rect.left < obj.rect.right) and \
-                        not self.rect.top >= obj.rect.bottom:
-                    self.rect.bottom = obj.rect.top
-                    self.y_vel = 0
-                    falling = False
-                    break
-        if falling:
+        floor = collision.ground(self.rect, self.game_objects['collide_grid'], self.game_objects['floor_map'])
+        if floor is None:
             self.state = c.JUMP  # using jump state instead of fall
             self.y_vel += c.GRAVITY
             self.frame_index = 4
-        elif self.state == c.JUMP:
-            self.state = c.WALK
-        self.rect.y += self.y_vel
+        else:
+            self.y_vel = 0
+            if self.state == c.JUMP:
+                self.state = c.WALK
+        self.move_down(round(self.y_vel))
+
+    def move_down(self, dy):
+        # moves mario vertically, landing on anything in his way when going down, going up is left
+        # to the blocks so they can tell they were hit from below
+        if dy <= 0:
+            self.rect.y += dy
+        elif collision.move(self.rect, 0, dy, self.game_objects['floor_map'], self.game_objects['collide_grid']):
+            self.y_vel = 0
 
     def handle_state(self, keys):
         # mario's current state
@@ -551,11 +485,11 @@ class Mario(pg.sprite.Sprite):
 
     def shoot_fireball(self):
         # shoot fireball, but only 2 at a time
-        if (pg.time.get_ticks() - self.timers['last_fireball']) > 200:
+        if (game_clock.get_ticks() - self.timers['last_fireball']) > 200:
             if self.fireball_controller.throw_fireball():
                 self.SFX['fireball'].play()
                 self.state_info['allow_fireball'] = False
-                self.timers['last_fireball'] = pg.time.get_ticks()
+                self.timers['last_fireball'] = game_clock.get_ticks()
 
                 self.frame_index = 6
                 if self.state_info['facing_right']:
@@ -571,16 +505,16 @@ class Mario(pg.sprite.Sprite):
 
         if self.frame_index == 0:
             self.frame_index += 1
-            self.timers['walking'] = pg.time.get_ticks()
+            self.timers['walking'] = game_clock.get_ticks()
         else:
-            if (pg.time.get_ticks() - self.timers['walking'] >
+            if (game_clock.get_ticks() - self.timers['walking'] >
                     self.calculate_animation_speed()):
                 if self.frame_index < 3:
                     self.frame_index += 1
                 else:
                     self.frame_index = 1
 
-                self.timers['walking'] = pg.time.get_ticks()
+                self.timers['walking'] = game_clock.get_ticks()
 
         if keys[self.keybinding['action']]:
             self.max_x_vel = c.MAX_RUN_SPEED
@@ -687,8 +621,8 @@ class Mario(pg.sprite.Sprite):
     def jumping_to_death(self):
         # jumps and then dies right after
         if self.timers['death'] == 0:
-            self.timers['death'] = pg.time.get_ticks()
-        elif (pg.time.get_ticks() - self.timers['death']) > 500:
+            self.timers['death'] = game_clock.get_ticks()
+        elif (game_clock.get_ticks() - self.timers['death']) > 500:
             self.rect.y += self.y_vel
             self.y_vel += self.gravity
         if not self.state_info['death_finish'] and self.rect.y > self.screen.get_height() * 2:
@@ -712,7 +646,7 @@ class Mario(pg.sprite.Sprite):
         self.state_info['in_transition'] = True
 
         if self.timers['transition'] == 0:
-            self.timers['transition'] = pg.time.get_ticks()
+            self.timers['transition'] = game_clock.get_ticks()
         elif self.timer_between_these_two_times(135, 200):
             self.set_mario_to_middle_image()
         elif self.timer_between_these_two_times(200, 365):
@@ -754,7 +688,7 @@ class Mario(pg.sprite.Sprite):
 
     def timer_between_these_two_times(self, start_time, end_time):
         # timer for the animation
-        if start_time <= (pg.time.get_ticks() - self.timers['transition']) < end_time:
+        if start_time <= (game_clock.get_ticks() - self.timers['transition']) < end_time:
             return True
         return False
 
@@ -807,37 +741,37 @@ class Mario(pg.sprite.Sprite):
                       self.fire_frames[0][1]]
 
         if self.timers['fire_transition'] == 0:
-            self.timers['fire_transition'] = pg.time.get_ticks()
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) > 65 and (
-                pg.time.get_ticks() - self.timers['fire_transition']) < 130:
+            self.timers['fire_transition'] = game_clock.get_ticks()
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) > 65 and (
+                game_clock.get_ticks() - self.timers['fire_transition']) < 130:
             self.image = frames[0]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 195:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 195:
             self.image = frames[1]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 260:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 260:
             self.image = frames[0]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 325:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 325:
             self.image = frames[1]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 390:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 390:
             self.image = frames[0]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 455:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 455:
             self.image = frames[1]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 520:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 520:
             self.image = frames[0]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 585:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 585:
             self.image = frames[1]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 650:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 650:
             self.image = frames[0]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 715:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 715:
             self.image = frames[1]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 780:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 780:
             self.image = frames[0]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 845:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 845:
             self.image = frames[1]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 910:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 910:
             self.image = frames[0]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 975:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 975:
             self.image = frames[1]
-        elif (pg.time.get_ticks() - self.timers['fire_transition']) < 1040:
+        elif (game_clock.get_ticks() - self.timers['fire_transition']) < 1040:
             self.image = frames[1]
             self.state_info['fire'] = True
             self.state_info['in_transition'] = False
@@ -862,48 +796,48 @@ class Mario(pg.sprite.Sprite):
                       ]
 
         if self.timers['transition'] == 0:
-            self.timers['transition'] = pg.time.get_ticks()
-        elif (pg.time.get_ticks() - self.timers['transition']) < 265:
+            self.timers['transition'] = game_clock.get_ticks()
+        elif (game_clock.get_ticks() - self.timers['transition']) < 265:
             self.image = frames[0]
             self.hurt_invincible_check()
             self.adjust_rect()
-        elif (pg.time.get_ticks() - self.timers['transition']) < 330:
+        elif (game_clock.get_ticks() - self.timers['transition']) < 330:
             self.image = frames[1]
             self.hurt_invincible_check()
             self.adjust_rect()
-        elif (pg.time.get_ticks() - self.timers['transition']) < 395:
+        elif (game_clock.get_ticks() - self.timers['transition']) < 395:
             self.image = frames[2]
             self.hurt_invincible_check()
             self.adjust_rect()
-        elif (pg.time.get_ticks() - self.timers['transition']) < 460:
+        elif (game_clock.get_ticks() - self.timers['transition']) < 460:
             self.image = frames[1]
             self.hurt_invincible_check()
             self.adjust_rect()
-        elif (pg.time.get_ticks() - self.timers['transition']) < 525:
+        elif (game_clock.get_ticks() - self.timers['transition']) < 525:
             self.image = frames[2]
             self.hurt_invincible_check()
             self.adjust_rect()
-        elif (pg.time.get_ticks() - self.timers['transition']) < 590:
+        elif (game_clock.get_ticks() - self.timers['transition']) < 590:
             self.image = frames[1]
             self.hurt_invincible_check()
             self.adjust_rect()
-        elif (pg.time.get_ticks() - self.timers['transition']) < 655:
+        elif (game_clock.get_ticks() - self.timers['transition']) < 655:
             self.image = frames[2]
             self.hurt_invincible_check()
             self.adjust_rect()
-        elif (pg.time.get_ticks() - self.timers['transition']) < 720:
+        elif (game_clock.get_ticks() - self.timers['transition']) < 720:
             self.image = frames[1]
             self.hurt_invincible_check()
             self.adjust_rect()
-        elif (pg.time.get_ticks() - self.timers['transition']) < 785:
+        elif (game_clock.get_ticks() - self.timers['transition']) < 785:
             self.image = frames[2]
             self.hurt_invincible_check()
             self.adjust_rect()
-        elif (pg.time.get_ticks() - self.timers['transition']) < 850:
+        elif (game_clock.get_ticks() - self.timers['transition']) < 850:
             self.image = frames[1]
             self.hurt_invincible_check()
             self.adjust_rect()
-        elif (pg.time.get_ticks() - self.timers['transition']) < 915:
+        elif (game_clock.get_ticks() - self.timers['transition']) < 915:
             self.image = frames[2]
             self.adjust_rect()
             self.state_info['in_transition'] = False
@@ -911,6 +845,7 @@ class Mario(pg.sprite.Sprite):
             self.state_info['big'] = False
             self.timers['transition'] = 0
             self.timers['hurt_invincible_1'] = 0
+            self.state_info['blink_hidden'] = False
         self.become_small()
 
     def adjust_rect(self):
@@ -946,21 +881,21 @@ class Mario(pg.sprite.Sprite):
             self.right_frames = self.right_small_normal_frames
 
         if self.timers['flag_pole'] == 0:
-            self.timers['flag_pole'] = pg.time.get_ticks()
+            self.timers['flag_pole'] = game_clock.get_ticks()
         elif self.rect.bottom < 493:
-            if (pg.time.get_ticks() - self.timers['flag_pole']) < 65:
+            if (game_clock.get_ticks() - self.timers['flag_pole']) < 65:
                 self.image = self.right_frames[9]
-            elif (pg.time.get_ticks() - self.timers['flag_pole']) < 130:
+            elif (game_clock.get_ticks() - self.timers['flag_pole']) < 130:
                 self.image = self.right_frames[10]
-            elif (pg.time.get_ticks() - self.timers['flag_pole']) >= 130:
-                self.timers['flag_pole'] = pg.time.get_ticks()
+            elif (game_clock.get_ticks() - self.timers['flag_pole']) >= 130:
+                self.timers['flag_pole'] = game_clock.get_ticks()
 
             self.rect.right = self.flag_pole_right
             self.y_vel = 5
             self.rect.y += self.y_vel
 
             if self.rect.bottom >= 488:
-                self.timers['flag_pole'] = pg.time.get_ticks()
+                self.timers['flag_pole'] = game_clock.get_ticks()
 
         elif self.rect.bottom >= 493:
             self.image = self.right_frames[10]
@@ -968,9 +903,9 @@ class Mario(pg.sprite.Sprite):
     def sitting_at_bottom_of_pole(self):
         # animation for when mario hits the bottom of the pole
         if self.timers['flag_pole'] == 0:
-            self.timers['flag_pole'] = pg.time.get_ticks()
+            self.timers['flag_pole'] = game_clock.get_ticks()
             self.image = self.left_frames[10]
-        elif (pg.time.get_ticks() - self.timers['flag_pole']) < 210:
+        elif (game_clock.get_ticks() - self.timers['flag_pole']) < 210:
             self.image = self.left_frames[10]
         else:
             self.state_info['in_transition'] = False
@@ -998,16 +933,16 @@ class Mario(pg.sprite.Sprite):
         if self.x_vel < self.max_x_vel:
             self.x_vel += self.x_accel
 
-        if self.timers['walking'] == 0 or (pg.time.get_ticks() - self.timers['walking']) > 200:
-            self.timers['walking'] = pg.time.get_ticks()
+        if self.timers['walking'] == 0 or (game_clock.get_ticks() - self.timers['walking']) > 200:
+            self.timers['walking'] = game_clock.get_ticks()
 
-        elif (pg.time.get_ticks() - self.timers['walking']) > \
+        elif (game_clock.get_ticks() - self.timers['walking']) > \
                 self.calculate_animation_speed():
             if self.frame_index < 3:
                 self.frame_index += 1
             else:
                 self.frame_index = 1
-            self.timers['walking'] = pg.time.get_ticks()
+            self.timers['walking'] = game_clock.get_ticks()
 
     def falling_at_end_of_level(self):
         # adds gravity when mario is falling from the flag pole
@@ -1022,10 +957,10 @@ class Mario(pg.sprite.Sprite):
 
     def check_if_invincible(self):
         if self.state_info['invincible']:
-            if (pg.time.get_ticks() - self.timers['invincible_start']) < 10000:
+            if (game_clock.get_ticks() - self.timers['invincible_start']) < 10000:
                 self.state_info['losing_invincibility'] = False
                 self.change_frame_list(30)
-            elif (pg.time.get_ticks() - self.timers['invincible_start']) < 12000:
+            elif (game_clock.get_ticks() - self.timers['invincible_start']) < 12000:
                 self.state_info['losing_invincibility'] = True
                 self.change_frame_list(100)
             else:
@@ -1040,7 +975,7 @@ class Mario(pg.sprite.Sprite):
                 self.left_frames = self.invincible_small_frames_list[0][1]
 
     def change_frame_list(self, frame_switch_speed):
-        if (pg.time.get_ticks() - self.timers['invincible_animation']) > frame_switch_speed:
+        if (game_clock.get_ticks() - self.timers['invincible_animation']) > frame_switch_speed:
             if self.invincible_index < (len(self.invincible_small_frames_list) - 1):
                 self.invincible_index += 1
             else:
@@ -1054,7 +989,7 @@ class Mario(pg.sprite.Sprite):
             self.right_frames = frames[0]
             self.left_frames = frames[1]
 
-            self.timers['invincible_animation'] = pg.time.get_ticks()
+            self.timers['invincible_animation'] = game_clock.get_ticks()
 
     def check_if_fire(self):
         if self.state_info['fire'] and not self.state_info['invincible']:
@@ -1065,25 +1000,29 @@ class Mario(pg.sprite.Sprite):
         # makes sure if hurt while invincible, enemy dies
         if self.state_info['hurt_invincible'] and self.state != c.BIG_TO_SMALL:
             if self.timers['hurt_invincible_2'] == 0:
-                self.timers['hurt_invincible_2'] = pg.time.get_ticks()
-            elif (pg.time.get_ticks() - self.timers['hurt_invincible_2']) < 2000:
+                self.timers['hurt_invincible_2'] = game_clock.get_ticks()
+            elif (game_clock.get_ticks() - self.timers['hurt_invincible_2']) < 2000:
                 self.hurt_invincible_check()
             else:
                 self.state_info['hurt_invincible'] = False
                 self.timers['hurt_invincible_1'] = 0
                 self.timers['hurt_invincible_2'] = 0
-                for frames in self.all_images:
-                    for image in frames:
-                        image.set_alpha(255)
+                self.state_info['blink_hidden'] = False
 
     def hurt_invincible_check(self):
+        # blink by swapping in the blank frame rather than changing the shared frame's alpha
         if self.timers['hurt_invincible_1'] == 0:
-            self.timers['hurt_invincible_1'] = pg.time.get_ticks()
-        elif (pg.time.get_ticks() - self.timers['hurt_invincible_1']) < 35:
-            self.image.set_alpha(0)
-        elif (pg.time.get_ticks() - self.timers['hurt_invincible_1']) < 70:
-            self.image.set_alpha(255)
-            self.timers['hurt_invincible_1'] = pg.time.get_ticks()
+            self.timers['hurt_invincible_1'] = game_clock.get_ticks()
+        elif (game_clock.get_ticks() - self.timers['hurt_invincible_1']) < 35:
+            self.state_info['blink_hidden'] = True
+        elif (game_clock.get_ticks() - self.timers['hurt_invincible_1']) < 70:
+            self.state_info['blink_hidden'] = False
+            self.timers['hurt_invincible_1'] = game_clock.get_ticks()
+        self.hide_if_blinking()
+
+    def hide_if_blinking(self):
+        if self.state_info['blink_hidden']:
+            self.image = self.blank_frames.get(self.image, self.image)
 
     def check_if_crouching(self):
         # check if crouching
@@ -1111,38 +1050,26 @@ class Mario(pg.sprite.Sprite):
             self.image = self.right_frames[self.frame_index]
         else:
             self.image = self.left_frames[self.frame_index]
-
-    def check_wall(self):
-        # add collision for walls
-        for obj in self.game_objects['collide_objs']:
-            pts = [obj.rect.midleft, obj.rect.midright]
-            for pt in pts:
-                if self.rect.collidepoint(pt):
-                    print('collide obj')
-                    print(obj.rect.x, obj.rect.y)
-                    if obj.rect.right > self.rect.right:
-                        self.rect.right = obj.rect.left
-                    else:
-                        self.rect.left = obj.rect.right + 1
-                    return True
-        return False
+        self.hide_if_blinking()
 
     def adjust_mario_position(self):
 
         # self.last_x_position = self.rect.right
-        if not self.check_left_side() and not self.check_wall():
-            self.rect.x += round(self.x_vel * 2)
+        if not self.check_left_side():     # swept so running fast can't carry him through a wall
+            collision.move(self.rect, round(self.x_vel * 2), 0, self.game_objects['floor_map'],
+                           self.game_objects['collide_grid'])
         # self.rect.x += round(self.x_vel)
         self.check_mario_x_collisions()
 
         if not self.state_info['in_transition']:
-            self.rect.y += round(self.y_vel)
+            self.move_down(round(self.y_vel))
             self.check_mario_y_collisions()
 
     def check_mario_x_collisions(self):
         # checks for any left or right collisions
+        awake = self.game_objects['active'].awake   # sleeping enemies are far from mario
         koopa = None
-        for k in self.game_objects['koopa']:
+        for k in awake['koopa']:
             k_pts = [k.rect.midleft, k.rect.midright]
             for pt in k_pts:
                 if self.rect.collidepoint(pt):
@@ -1151,7 +1078,7 @@ class Mario(pg.sprite.Sprite):
             if koopa:
                 break
         goomba = None
-        for g in self.game_objects['goomba']:
+        for g in awake['goomba']:
             g_pts = [g.rect.midleft, g.rect.midright]
             for pt in g_pts:
                 if self.rect.collidepoint(pt):
@@ -1182,7 +1109,7 @@ class Mario(pg.sprite.Sprite):
                 self.state_info['invincible'] = True
                 pg.mixer.music.load('audio/Star-Theme.ogg')
                 pg.mixer.music.play()
-                self.timers['invincible_start'] = pg.time.get_ticks()
+                self.timers['invincible_start'] = game_clock.get_ticks()
             elif power_up.item_type == Item.MUSHROOM:
                 self.SFX['powerup'].play()
                 self.y_vel = -1
@@ -1209,13 +1136,14 @@ class Mario(pg.sprite.Sprite):
 
     def check_mario_y_collisions(self):
         # checks for collisions up and down
+        awake = self.game_objects['active'].awake
         enemy = None
-        for g in self.game_objects['goomba']:
+        for g in awake['goomba']:
             if self.rect.collidepoint(g.rect.midtop):
                 enemy = g
                 break
         if not enemy:
-            for k in self.game_objects['koopa']:
+            for k in awake['koopa']:
                 if self.rect.collidepoint(k.rect.midtop):
                     enemy = k
                     break
@@ -1228,7 +1156,8 @@ class Mario(pg.sprite.Sprite):
         # checks if enemy is on brick
         brick.rect.y -= 5
 
-        enemy = pg.sprite.spritecollideany(brick, self.game_objects['goomba'], self.game_objects['koopa'])
+        awake = self.game_objects['active'].awake
+        enemy = pg.sprite.spritecollideany(brick, awake['goomba']) or pg.sprite.spritecollideany(brick, awake['koopa'])
 
         if enemy:
             self.SFX['kick'].play()
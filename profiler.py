@@ -0,0 +1,107 @@
+from collections import deque
+import csv
+import json
+import time
+import pygame
+
+WHITE = (255, 255, 255)
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    # times each stage of a frame and keeps rolling p50/p95/p99 over the last few hundred frames
+    def __init__(self, screen, enabled=False, window=300, refresh=30):
+        self.screen = screen
+        self.enabled = enabled      # collect timings
+        self.show = enabled         # draw the overlay
+        self.stages = []            # stage names in the order they first ran
+        self.frames = deque(maxlen=window)  # stage name -> milliseconds, one dict per frame
+        self.refresh = refresh      # frames between overlay redraws
+        self.frame_count = 0
+        self.current = None
+        self.frame_start = 0
+        self.last_lap = 0
+        self.font = None
+        self.lines = []
+
+    def start_frame(self):
+        # begin timing a frame
+        if not self.enabled:
+            return
+        self.current = {}
+        self.frame_start = self.last_lap = time.perf_counter()
+
+    def lap(self, stage):
+        # charge the time since the last lap to a stage
+        if self.current is None:
+            return
+        now = time.perf_counter()
+        if stage not in self.current and stage not in self.stages:
+            self.stages.append(stage)
+        self.current[stage] = self.current.get(stage, 0.0) + (now - self.last_lap) * 1000
+        self.last_lap = now
+
+    def end_frame(self):
+        # finish timing a frame
+        if self.current is None:
+            return
+        self.current['total'] = (time.perf_counter() - self.frame_start) * 1000
+        self.frames.append(self.current)
+        self.current = None
+        self.frame_count += 1
+        if self.show and self.frame_count % self.refresh == 0:
+            self.render()
+
+    def percentiles(self, stage):
+        # rolling percentiles in milliseconds for a stage
+        samples = sorted(frame.get(stage, 0.0) for frame in self.frames)
+        if not samples:
+            return {'p' + str(p): 0.0 for p in PERCENTILES}
+        last = len(samples) - 1
+        return {'p' + str(p): samples[int(round(p / 100 * last))] for p in PERCENTILES}
+
+    def summary(self):
+        # percentiles for every stage and the whole frame
+        return {stage: self.percentiles(stage) for stage in self.stages + ['total']}
+
+    def render(self):
+        # render the overlay text
+        if not self.font:
+            self.font = pygame.font.Font('fonts/PressStart2P-Regular.ttf', 10)
+        self.lines = [self.font.render('{:<8} p50   p95   p99'.format('ms'), True, WHITE)]
+        for stage, values in self.summary().items():
+            text = '{:<8}{p50:5.2f} {p95:5.2f} {p99:5.2f}'.format(stage, **values)
+            self.lines.append(self.font.render(text, True, WHITE))
+
+    def blit(self):
+        # draw the overlay under the HUD, returns the area drawn
+        if not self.show:
+            return None
+        y = 80
+        width = 0
+        for line in self.lines:
+            self.screen.blit(line, (10, y))
+            y += line.get_height() + 2
+            width = max(width, line.get_width())
+        return pygame.Rect(10, 80, width, y - 80)
+
+    def toggle(self):
+        # show or hide the overlay, timing starts with it
+        self.show = not self.show
+        self.enabled = self.enabled or self.show
+
+    def dump_csv(self, path):
+        # per frame timings of the rolling window
+        columns = self.stages + ['total']
+        with open(path, 'w', newline='') as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(['frame'] + columns)
+            first = self.frame_count - len(self.frames)
+            for num, frame in enumerate(self.frames):
+                writer.writerow([first + num] + ['{:.4f}'.format(frame.get(stage, 0.0)) for stage in columns])
+
+    def dump_json(self, path):
+        # percentiles plus per frame timings of the rolling window
+        with open(path, 'w') as outfile:
+            json.dump({'frames': self.frame_count, 'percentiles': self.summary(), 'samples': list(self.frames)},
+                      outfile, indent=2)
@@ -0,0 +1,157 @@
+from argparse import ArgumentParser
+from headless import ScriptedKeys
+import struct
+import pygame
+
+MAGIC = b'MREP'
+VERSION = 1
+HEADER = struct.Struct('<4sBHHi')   # magic, version, fps, number of tracked keys, game time at start
+FRAME = struct.Struct('<HB')        # bitmask of held tracked keys, number of events this frame
+EVENT = struct.Struct('<Ii')        # event type, key (0 for events without a key)
+RECORDED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP)
+TRACKED_KEYS = (pygame.K_LSHIFT, pygame.K_SPACE, pygame.K_LEFT, pygame.K_RIGHT,
+                pygame.K_DOWN, pygame.K_UP, pygame.K_p, pygame.K_RETURN)
+
+
+class KeyboardInput:
+    # live keyboard and event queue, as an input source
+    @staticmethod
+    def get_pressed():
+        return pygame.key.get_pressed()
+
+    @staticmethod
+    def get_events():
+        return pygame.event.get()
+
+    def advance(self):
+        pass
+
+
+class InputRecorder:
+    # wraps an input source and writes what it produced each frame to a replay file
+    def __init__(self, source, path, fps=60, start_ticks=0, keys=TRACKED_KEYS):
+        self.source = source
+        self.keys = keys
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, fps, len(keys), start_ticks))
+        self.file.write(struct.pack('<{}i'.format(len(keys)), *keys))
+        self.pressed = None
+        self.events = []
+        self.frames = 0
+
+    def get_pressed(self):
+        # key states are read once per frame so every caller sees the same snapshot
+        if self.pressed is None:
+            self.pressed = self.source.get_pressed()
+        return self.pressed
+
+    def get_events(self):
+        events = self.source.get_events()
+        self.events.extend(event for event in events if event.type in RECORDED_EVENTS)
+        return events
+
+    def advance(self):
+        # write out the frame that just finished
+        pressed = self.get_pressed()
+        mask = 0
+        for bit, key in enumerate(self.keys):
+            if pressed[key]:
+                mask |= 1 << bit
+        self.file.write(FRAME.pack(mask, len(self.events)))
+        for event in self.events:
+            self.file.write(EVENT.pack(event.type, getattr(event, 'key', 0)))
+        self.frames += 1
+        self.pressed = None
+        self.events = []
+        self.source.advance()
+
+    def close(self):
+        self.file.close()
+
+
+class ReplayInput:
+    # plays back a replay file as an input source, frame by frame
+    def __init__(self, path):
+        with open(path, 'rb') as infile:
+            data = infile.read()
+        magic, version, self.fps, key_count, self.start_ticks = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('{} is not a version {} replay file'.format(path, VERSION))
+        offset = HEADER.size
+        self.keys = struct.unpack_from('<{}i'.format(key_count), data, offset)
+        offset += 4 * key_count
+        self.frames = []    # (held keys, [(event type, key)]) per frame
+        while offset < len(data):
+            mask, event_count = FRAME.unpack_from(data, offset)
+            offset += FRAME.size
+            events = []
+            for _ in range(event_count):
+                events.append(EVENT.unpack_from(data, offset))
+                offset += EVENT.size
+            held = ScriptedKeys(key for bit, key in enumerate(self.keys) if mask & (1 << bit))
+            self.frames.append((held, events))
+        self.frame = 0
+        self.no_keys = ScriptedKeys()
+
+    def __len__(self):
+        return len(self.frames)
+
+    def finished(self):
+        return self.frame >= len(self.frames)
+
+    def get_pressed(self):
+        if self.finished():
+            return self.no_keys
+        return self.frames[self.frame][0]
+
+    def get_events(self):
+        if self.finished():
+            return []
+        return [pygame.event.Event(event_type, key=key) if key else pygame.event.Event(event_type)
+                for event_type, key in self.frames[self.frame][1]]
+
+    def advance(self):
+        self.frame += 1
+
+
+def record(path):
+    # play a game from the keyboard on a fixed-step clock, recording it to a replay file
+    from game import Game
+    from gameClock import game_clock, FIXED_STEP
+    from eventLoop import EventLoop
+    game = Game(clock_mode=FIXED_STEP)
+    loop = EventLoop(loop_running=True, actions=game.menu.action_map)
+    while not game.menu.start:
+        game.clock.tick(60)
+        loop.check_events()
+        game.update()
+    recorder = InputRecorder(KeyboardInput(), path, game_clock.fps, game_clock.get_ticks())
+    game.input_script = recorder
+    try:
+        game.start_game()
+    finally:
+        recorder.close()
+    return recorder.frames
+
+
+def play(path, headless=True):
+    # feed a replay file back into the game, returns frames played
+    from game import Game
+    from gameClock import game_clock, FIXED_STEP
+    replay_input = ReplayInput(path)
+    game = Game(headless=headless, input_script=replay_input, clock_mode=None if headless else FIXED_STEP)
+    game_clock.fps = replay_input.fps
+    game_clock.reset(replay_input.start_ticks)
+    return game.simulate(len(replay_input))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Record or play back frame exact input replays')
+    parser.add_argument('action', choices=['record', 'play'])
+    parser.add_argument('file', help='replay file')
+    parser.add_argument('--window', action='store_true', help='play back in a window instead of headless')
+    args = parser.parse_args()
+    if args.action == 'record':
+        print('recorded {} frames'.format(record(args.file)))
+    else:
+        print('played {} frames'.format(play(args.file, headless=not args.window)))
@@ -0,0 +1,82 @@
+from pygame import mixer
+
+LOW = 0         # frequent effects that can be cut off, like coins
+NORMAL = 1
+HIGH = 2        # effects that must always be heard, like stomps and power ups
+CHANNELS = {HIGH: 2, NORMAL: 3, LOW: 3}     # mixer channels set aside for each priority
+PRIORITIES = {
+    'audio/Coin.wav': LOW,
+    'audio/Break-Block.wav': LOW,
+    'audio/Bump-Block.wav': LOW,
+    'audio/Fireball.wav': NORMAL,
+    'audio/Small-Mario-Jump.wav': NORMAL,
+    'audio/Big-Mario-Jump.wav': NORMAL,
+    'audio/Mario-Stomp.wav': HIGH,
+    'audio/Mario-Kick-Shell.wav': HIGH,
+    'audio/Mario-Shrink.wav': HIGH,
+    'audio/Get-Powerup.wav': HIGH,
+    'audio/Powerup-Appear.wav': HIGH,
+    'audio/1-Up.wav': HIGH,
+    'audio/Time-Warning.wav': HIGH
+}
+
+
+class SoundHandle:
+    # shared handle to a decoded clip, played on a channel set aside for its priority
+    def __init__(self, bank, sound, priority):
+        self.bank = bank
+        self.sound = sound
+        self.priority = priority
+
+    def play(self):
+        return self.bank.play(self.sound, self.priority)
+
+    def stop(self):
+        self.sound.stop()
+
+
+class SoundBank:
+    # process wide bank of sound effects, each clip is decoded once and shared, and
+    # plays on its own priority's channels so a burst of low priority sounds can't
+    # take the channels needed for important ones
+    def __init__(self):
+        self.handles = {}   # path -> SoundHandle
+        self.pools = None   # priority -> mixer channels, ordered from least to most recently started
+        self.decodes = 0
+
+    def load(self, path, priority=None):
+        # shared handle for a sound file
+        handle = self.handles.get(path)
+        if handle is None:
+            if priority is None:
+                priority = PRIORITIES.get(path, NORMAL)
+            handle = SoundHandle(self, mixer.Sound(path), priority)
+            self.handles[path] = handle
+            self.decodes += 1
+        return handle
+
+    def setup_channels(self):
+        # reserve mixer channels and split them into a pool per priority
+        total = sum(CHANNELS.values())
+        if mixer.get_num_channels() < total:
+            mixer.set_num_channels(total)
+        mixer.set_reserved(total)   # keep Sound.play from picking the bank's channels itself
+        self.pools = {}
+        first = 0
+        for priority in (HIGH, NORMAL, LOW):
+            self.pools[priority] = [mixer.Channel(num) for num in range(first, first + CHANNELS[priority])]
+            first += CHANNELS[priority]
+
+    def play(self, sound, priority=NORMAL):
+        # play on an idle channel of the priority's pool, or cut off the longest playing one in that pool
+        if self.pools is None:
+            self.setup_channels()
+        pool = self.pools[priority]
+        channel = next((channel for channel in pool if not channel.get_busy()), pool[0])
+        pool.remove(channel)
+        pool.append(channel)
+        channel.play(sound)
+        return channel
+
+
+sound_bank = SoundBank()
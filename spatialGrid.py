@@ -0,0 +1,82 @@
+class SpatialGrid:
+    # buckets collide-able objects (sprites or plain Rects) by map cell so that
+    # collision checks only have to look at objects near the thing being tested
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self.cells = {}     # (cell x, cell y) -> {id(obj): obj}
+        self.entries = {}   # id(obj) -> [insertion order, obj, cells covered]
+        self.counter = 0
+
+    @staticmethod
+    def get_rect(obj):
+        # sprites are indexed by their rect, rects are indexed as they are
+        return getattr(obj, 'rect', obj)
+
+    def cell_range(self, rect):
+        # all cells touched by the rect, edges included so touching objects are found
+        size = self.cell_size
+        return [(cell_x, cell_y)
+                for cell_x in range(rect.left // size, rect.right // size + 1)
+                for cell_y in range(rect.top // size, rect.bottom // size + 1)]
+
+    def add(self, obj):
+        # index an object in every cell it covers
+        if id(obj) in self.entries:
+            self.move(obj)
+            return
+        cells = self.cell_range(self.get_rect(obj))
+        self.entries[id(obj)] = [self.counter, obj, cells]
+        self.counter += 1
+        for cell in cells:
+            self.cells.setdefault(cell, {})[id(obj)] = obj
+
+    def remove(self, obj):
+        # remove an object from the grid
+        entry = self.entries.pop(id(obj), None)
+        if entry:
+            self.clear_cells(obj, entry[2])
+
+    def move(self, obj):
+        # re-index an object after its rect has changed
+        entry = self.entries.get(id(obj))
+        if not entry:
+            self.add(obj)
+            return
+        cells = self.cell_range(self.get_rect(obj))
+        if cells != entry[2]:
+            self.clear_cells(obj, entry[2])
+            entry[2] = cells
+            for cell in cells:
+                self.cells.setdefault(cell, {})[id(obj)] = obj
+
+    def clear(self):
+        # remove every object from the grid
+        self.cells.clear()
+        self.entries.clear()
+        self.counter = 0
+
+    def clear_cells(self, obj, cells):
+        # remove object from the given cells, dropping any cells left empty
+        for cell in cells:
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.pop(id(obj), None)
+                if not bucket:
+                    del self.cells[cell]
+
+    def query(self, rect):
+        # objects near the rect, in the order they were added to the grid
+        found = {}
+        for cell in self.cell_range(rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        if len(found) < 2:
+            return list(found.values())
+        return sorted(found.values(), key=lambda obj: self.entries[id(obj)][0])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, obj):
+        return id(obj) in self.entries
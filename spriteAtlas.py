@@ -0,0 +1,128 @@
+from hashlib import sha1
+import json
+import os
+import pygame
+
+CACHE_DIR = 'cache/atlas'
+ATLAS_WIDTH = 1024
+PADDING = 1     # gap between frames so scaled or filtered blits never pick up a neighbour
+
+
+class SpriteAtlas:
+    # every frame of a sprite baked into one surface, frame lists are subsurface views of it
+    def __init__(self, surface, table):
+        self.surface = surface
+        self.table = table      # frame list name -> [(x, y, width, height)] in the atlas
+        self.lists = {name: [surface.subsurface(rect) for rect in rects] for name, rects in table.items()}
+        self.hidden = None      # frame -> invisible frame of the same size, made on first use
+
+    def frames(self, name):
+        # a new list of the shared frames
+        return list(self.lists[name])
+
+    def blanks(self):
+        # an invisible stand-in for every frame, for blinking without changing the shared frames'
+        # alpha, frames of the same size share one stand-in
+        if self.hidden is None:
+            colorkey = self.surface.get_colorkey() or (0, 0, 0)
+            by_size = {}
+            self.hidden = {}
+            for frames in self.lists.values():
+                for frame in frames:
+                    size = frame.get_size()
+                    if size not in by_size:
+                        blank = pygame.Surface(size).convert()
+                        blank.fill(colorkey)
+                        blank.set_colorkey(colorkey, pygame.RLEACCEL)
+                        by_size[size] = blank
+                    self.hidden[frame] = by_size[size]
+        return self.hidden
+
+
+def pack(frame_lists):
+    # place frames left to right in rows, returns the atlas surface and the frame table
+    table = {}
+    x = y = row_height = 0
+    for name, frames in frame_lists.items():
+        table[name] = []
+        for frame in frames:
+            width, height = frame.get_size()
+            if x + width > ATLAS_WIDTH:
+                x, y = 0, y + row_height + PADDING
+                row_height = 0
+            table[name].append((x, y, width, height))
+            x += width + PADDING
+            row_height = max(row_height, height)
+    surface = pygame.Surface((ATLAS_WIDTH, y + row_height))
+    for name, frames in frame_lists.items():
+        for frame, rect in zip(frames, table[name]):
+            surface.blit(frame, rect[:2])
+    return surface, table
+
+
+class AtlasCache:
+    # process wide store of baked sprite atlases, also saved to disk as an image and a frame
+    # table so later runs load one surface instead of cutting and scaling every frame
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.atlases = {}   # name -> (source hash, SpriteAtlas)
+        self.bakes = 0
+
+    def files(self, name):
+        base = os.path.join(self.cache_dir, name)
+        return base + '.png', base + '.json'
+
+    def read(self, name, digest):
+        # the atlas surface and frame table from disk, or None if they are missing or out of date
+        image_file, table_file = self.files(name)
+        try:
+            with open(table_file) as infile:
+                data = json.load(infile)
+            if data['hash'] != digest:
+                return None
+            return pygame.image.load(image_file), {key: [tuple(rect) for rect in rects]
+                                                   for key, rects in data['frames'].items()}
+        except (OSError, ValueError, KeyError, pygame.error):
+            return None
+
+    def write(self, name, digest, surface, table):
+        image_file, table_file = self.files(name)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        pygame.image.save(surface, image_file)
+        with open(table_file, 'w') as outfile:
+            json.dump({'hash': digest, 'frames': table}, outfile)
+
+    def load(self, name, sheet_file, spec, cut, mirrors=None, colorkey=None, scale=1):
+        # atlas for frames cut out of a sprite sheet, spec maps list names to sheet rects,
+        # cut(x, y, width, height) makes a finished frame and mirrors maps list names to the
+        # list they are a horizontally flipped copy of
+        mirrors = mirrors or {}
+        digest = sha1()
+        with open(sheet_file, 'rb') as infile:
+            digest.update(infile.read())
+        digest.update(json.dumps([spec, mirrors, scale], sort_keys=True).encode('utf-8'))
+        digest = digest.hexdigest()
+        cached = self.atlases.get(name)
+        if cached and cached[0] == digest:
+            return cached[1]
+        baked = self.read(name, digest)
+        if baked is None:
+            frame_lists = {key: [cut(*rect) for rect in rects] for key, rects in spec.items()}
+            for key, source in mirrors.items():
+                frame_lists[key] = [pygame.transform.flip(frame, True, False) for frame in frame_lists[source]]
+            baked = pack(frame_lists)
+            self.bakes += 1
+            try:
+                self.write(name, digest, *baked)
+            except (OSError, pygame.error):
+                pass    # a read only checkout just bakes every run
+        surface, table = baked
+        surface = surface.convert()
+        if colorkey is not None:
+            surface.set_colorkey(colorkey)
+        atlas = SpriteAtlas(surface, table)
+        self.atlases[name] = digest, atlas
+        return atlas
+
+
+atlas_cache = AtlasCache()
@@ -0,0 +1,55 @@
+from pyscroll.common import rect_to_bb
+from pyscroll.data import TiledMapData
+import pygame
+
+STATIC_LAYERS = ('flag', 'decorations')     # object layers whose images never move, in drawing order
+
+
+class StaticLayerData(TiledMapData):
+    # map data with the images of static objects like hills, clouds and the flag composited into
+    # map cells on an extra tile layer over the others, so the renderer draws them into its tile
+    # buffer once as it scrolls instead of blitting each one as a sprite every frame
+    def __init__(self, tmx, layer_names=STATIC_LAYERS):
+        super(StaticLayerData, self).__init__(tmx)
+        self.static_layer = max(tmx.visible_tile_layers, default=-1) + 1
+        self.cells = {}     # (x, y) in tiles -> composited image of that cell
+        for name in layer_names:
+            try:
+                objects = tmx.get_layer_by_name(name)
+            except ValueError:
+                continue
+            for obj in objects:
+                if obj.image:
+                    self.add_image(obj.image, int(obj.x), int(obj.y))
+        for key, cell in self.cells.items():
+            self.cells[key] = cell.convert_alpha()
+
+    def add_image(self, image, x, y):
+        # paint an image into every cell it covers
+        tile_width, tile_height = self.tile_size
+        width, height = image.get_size()
+        for ty in range(y // tile_height, (y + height - 1) // tile_height + 1):
+            for tx in range(x // tile_width, (x + width - 1) // tile_width + 1):
+                cell = self.cells.get((tx, ty))
+                if cell is None:
+                    cell = self.cells[tx, ty] = pygame.Surface((tile_width, tile_height), pygame.SRCALPHA)
+                cell.blit(image, (x - tx * tile_width, y - ty * tile_height))
+
+    @property
+    def visible_tile_layers(self):
+        return list(self.tmx.visible_tile_layers) + [self.static_layer]
+
+    def _get_tile_image(self, x, y, l):
+        if l == self.static_layer:
+            return self.cells.get((x, y))
+        return super(StaticLayerData, self)._get_tile_image(x, y, l)
+
+    def get_tile_images_by_rect(self, rect):
+        # the map's own tiles, then the static cells on top of them
+        yield from super(StaticLayerData, self).get_tile_images_by_rect(rect)
+        x1, y1, x2, y2 = rect_to_bb(rect)
+        for y in range(y1, y2 + 1):
+            for x in range(x1, x2 + 1):
+                cell = self.cells.get((x, y))
+                if cell:
+                    yield x, y, self.static_layer, cell
@@ -0,0 +1,51 @@
+from operator import itemgetter
+
+
+class SweepAndPrune:
+    # finds the enemies close enough to touch each other once per frame by sorting them on x and
+    # sweeping across, so each enemy only checks its few neighbours instead of every other enemy
+    def __init__(self, margin=16):
+        self.margin = margin    # slack for how far enemies can move or grow during the frame
+        self.near = {}      # id(sprite) -> (nearby goombas, nearby koopas) in group order
+        self.pairs = 0      # overlapping pairs found on the last update
+
+    def update(self, goombas, koopas):
+        # work out which enemies are near each other, keeping the order they have in their groups
+        margin = self.margin
+        entries = []
+        for kind, group in enumerate((goombas, koopas)):
+            for order, sprite in enumerate(group.sprites()):
+                rect = sprite.rect
+                entries.append((rect.left - margin, rect.right + margin, rect.top - margin, rect.bottom + margin,
+                                kind, order, sprite))
+        entries.sort(key=itemgetter(0))
+        found = ([[] for _ in entries], [[] for _ in entries])     # kind -> entry number -> [(order, sprite)]
+        active = []     # (entry number, entry) of the ones that might still overlap what comes next
+        pairs = 0
+        for num, entry in enumerate(entries):
+            left, right, top, bottom, kind, order, sprite = entry
+            if active:
+                active = [item for item in active if item[1][1] > left]     # drop the ones that end before this
+            for other_num, other in active:
+                if other[2] < bottom and top < other[3]:
+                    found[other[4]][num].append((other[5], other[6]))
+                    found[kind][other_num].append((order, sprite))
+                    pairs += 1
+            active.append((num, entry))
+        near = {}
+        for num, entry in enumerate(entries):
+            nearby_goombas, nearby_koopas = found[0][num], found[1][num]
+            nearby_goombas.sort()   # orders are unique within a group, so sprites are never compared
+            nearby_koopas.sort()
+            near[id(entry[6])] = ([sprite for order, sprite in nearby_goombas],
+                                  [sprite for order, sprite in nearby_koopas])
+        self.near = near
+        self.pairs = pairs
+
+    def nearby(self, sprite):
+        # (goombas, koopas) that might touch the sprite this frame, or None if it wasn't swept
+        return self.near.get(id(sprite))
+
+    def clear(self):
+        self.near = {}
+        self.pairs = 0
@@ -0,0 +1,7 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))    # the game's flat modules
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')   # tests never open a window or a sound card
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
@@ -0,0 +1,36 @@
+import os
+import pytest
+
+from game import Game
+from gameClock import game_clock
+from headless import InputScript
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def game(monkeypatch):
+    # a headless game run from the repo root, where its maps, images, fonts and sounds are
+    monkeypatch.chdir(ROOT)
+    game = Game(headless=True, input_script=InputScript.from_string('0-100000:right;40-70:space'))
+    yield game
+    game_clock.reset()
+
+
+def test_simulate_runs_without_a_display(game):
+    start = game.player_spawn.x
+    assert game.simulate(120) == 120
+    assert game.game_active
+    assert game.mario.rect.x > start    # the script walked mario to the right
+
+
+def test_simulate_is_repeatable(game):
+    frames = game.simulate(300)
+    first = game.mario.rect.copy(), game.score + game.mario.score, game.lives
+    game.game_active = False    # the same reset between runs as run_headless
+    game.game_won = False
+    game_clock.reset()
+    game.respawn()
+    game.input_script.reset()
+    assert game.simulate(300) == frames
+    assert (game.mario.rect.copy(), game.score + game.mario.score, game.lives) == first
@@ -0,0 +1,28 @@
+from pygame import Rect
+from pygame.sprite import Group, Sprite
+
+from levelSnapshot import GROUP_KEY, restore_state, save_state
+
+
+def test_group_key_holds_the_sprites_groups():
+    sprite = Sprite()
+    group = Group(sprite)
+    assert group in vars(sprite)[GROUP_KEY]
+
+
+def test_restore_keeps_live_group_membership():
+    sprite = Sprite()
+    sprite.rect = Rect(10, 20, 32, 32)
+    sprite.dead = False
+    before = Group(sprite)
+    state = save_state(sprite)
+    sprite.rect.x = 300
+    sprite.dead = True
+    sprite.added = 'since the snapshot'
+    before.remove(sprite)
+    after = Group(sprite)
+    restore_state(sprite, state)
+    assert sprite.rect == Rect(10, 20, 32, 32)
+    assert not sprite.dead
+    assert not hasattr(sprite, 'added')
+    assert sprite.groups() == [after]   # groups are put back by LevelSnapshot.restore, not copied over
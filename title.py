@@ -1,4 +1,5 @@
-from pygame import image, sprite, font, K_RETURN, KEYDOWN
+from pygame import sprite, font, K_RETURN, KEYDOWN
+from assetCache import asset_cache
 import json
 
 
@@ -6,7 +7,7 @@ class Logo(sprite.Sprite):
     # logo on title screen
     def __init__(self, screen):
         self.screen = screen
-        self.image = image.load('images/Super-Mario-Logo.png')
+        self.image = asset_cache.load_image('images/Super-Mario-Logo.png')
         self.rect = self.image.get_rect()
         self.position()
         super(Logo, self).__init__()